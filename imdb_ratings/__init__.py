@@ -1,5 +1,12 @@
-from .core.logging_config import setup_logging
-from .core.config import get_settings
+from typing import Any
 
-_settings = get_settings()
-logger = setup_logging()
+
+def __getattr__(name: str) -> Any:
+    """Create the shared logger on first access (PEP 562)."""
+    global logger
+
+    if name == "logger":
+        from .core.logging_config import setup_logging
+        logger = setup_logging()
+        return logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,13 +6,21 @@ validation and type safety. Configuration can be loaded from environment
 variables or a .env file.
 """
 
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Any, Final, Optional
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from imdb_ratings.core.constants import POSTGRES_MAX_PARAMETERS
+
+# Package directory used as the default root for logs and exports
+_PROJECT_ROOT: Final[Path] = Path(__file__).parent.parent
+
 
 class IMDBDataConfig(BaseModel):
     """Configuration for IMDB data processing."""
+
+    model_config = ConfigDict(frozen=True)
     
     # Dataset URLs
     basics_url: str = "https://datasets.imdbws.com/title.basics.tsv.gz"
@@ -26,32 +34,52 @@ class IMDBDataConfig(BaseModel):
     null_value: str = "\\N"
     genre_separator: str = ","
 
+    # Local dataset cache (IMDB refreshes the datasets daily)
+    cache_max_age_hours: float = Field(default=24, ge=0)
+
 class SupabaseConfig(BaseModel):
     """Configuration for Supabase connection."""
+
+    model_config = ConfigDict(frozen=True)
     
-    project_url: str
-    secret_key: str
+    project_url: str = Field(..., min_length=1)
+    secret_key: str = Field(..., min_length=1)
     
     # Table names
     titles_table: str = "titles"
     reviews_table: str = "reviews"
     weighted_ratings_table: str = "weighted_ratings"
+
+    # Client settings
+    schema_name: str = "public"
+    request_timeout: int = Field(default=60, ge=1)
     
     # Batch processing
-    batch_size: int = Field(default=1000, ge=1, le=10000)
+    batch_size: int = Field(default=1000, ge=1, le=10000)  # rows per read page (PostgREST max-rows)
+    upsert_batch_size: int = Field(default=10_000, ge=1, le=POSTGRES_MAX_PARAMETERS)
+    max_workers: int = Field(default=8, ge=1, le=32)
 
 
 class ScrapingConfig(BaseModel):
     """Configuration for web scraping."""
+
+    model_config = ConfigDict(frozen=True)
     
     # Request settings
     request_timeout: int = Field(default=10, ge=1)
     retry_total: int = Field(default=3, ge=0)
     retry_backoff_factor: float = Field(default=1.0, ge=0)
-    retry_status_codes: list[int] = [500, 502, 503, 504]
+    retry_status_codes: frozenset[int] = Field(default_factory=lambda: frozenset({500, 502, 503, 504}))
     
     # Rate limiting
-    request_delay: float = Field(default=0.3, ge=0)
+    request_delay: float = Field(default=0.3, ge=0)  # average seconds between GraphQL requests, across all workers
+
+    # On-disk cache of review pages, so re-runs skip pages already fetched (0 disables)
+    review_cache_max_age_hours: float = Field(default=0, ge=0)
+
+    # Concurrency (titles scraped in parallel over the shared session)
+    max_workers: int = Field(default=8, ge=1, le=64)
+    use_processes: bool = False  # one process (and session) per worker instead of threads
     
     # Review filtering
     min_helpful_votes: int = Field(default=1, ge=0)
@@ -67,6 +95,8 @@ class ScrapingConfig(BaseModel):
 
 class LoggingConfig(BaseModel):
     """Configuration for logging."""
+
+    model_config = ConfigDict(frozen=True)
     
     log_level: str = Field(default="INFO", pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")
     log_file: Optional[Path] = None
@@ -85,31 +115,42 @@ class Settings(BaseSettings):
     )
     
     # Supabase settings (from environment)
-    project_url: str = Field(..., alias="PROJECT_URL")
-    secret_key: str = Field(..., alias="SECRET_KEY")
+    project_url: str = Field(..., alias="PROJECT_URL", min_length=1)
+    secret_key: str = Field(..., alias="SECRET_KEY", min_length=1)
 
     # OMDB API
     omdb_api_key: str = Field(..., alias="OMDB_API")
     
     # Sub-configurations
     imdb: IMDBDataConfig = Field(default_factory=IMDBDataConfig)
-    supabase: SupabaseConfig = Field(default_factory=lambda: SupabaseConfig(
-        project_url="",  # Will be set in __init__
-        secret_key=""    # Will be set in __init__
-    ))
+    supabase: SupabaseConfig  # project_url/secret_key filled in by _populate_supabase
     scraping: ScrapingConfig = Field(default_factory=ScrapingConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     
     # Paths
-    project_root: Path = Field(default_factory=lambda: Path(__file__).parent.parent)
+    project_root: Path = _PROJECT_ROOT
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Set Supabase config from environment variables
-        self.supabase.project_url = self.project_url
-        self.supabase.secret_key = self.secret_key
-    
-    @property
+    @model_validator(mode="before")
+    @classmethod
+    def _populate_supabase(cls, data: Any) -> Any:
+        """Set Supabase config from environment variables.
+
+        Runs before validation so SUPABASE__* overrides of the other fields
+        are validated together with the connection settings.
+        """
+        if not isinstance(data, dict):
+            return data
+        supabase = data.get("supabase") or {}
+        if isinstance(supabase, SupabaseConfig):
+            supabase = supabase.model_dump()
+        supabase = dict(supabase)
+        for field, alias in (("project_url", "PROJECT_URL"), ("secret_key", "SECRET_KEY")):
+            value = data.get(alias, data.get(field))
+            if value is not None:
+                supabase[field] = value
+        return {**data, "supabase": supabase}
+    
+    @cached_property
     def log_file_path(self) -> Optional[Path]:
         """Get the full log file path."""
         if self.logging.log_file:
@@ -118,25 +159,23 @@ class Settings(BaseSettings):
             return self.project_root / self.logging.log_file
         return self.project_root / "logs" / "imdb_scraper.log"
     
-    @property
+    @cached_property
     def export_file_path(self) -> Path:
         """Get the default export file path."""
         return self.project_root / "titles.xlsx"
 
-
-# Global settings instance (singleton pattern)
-_settings: Optional[Settings] = None
+    @cached_property
+    def cache_dir_path(self) -> Path:
+        """Get the directory for downloaded dataset files."""
+        return self.project_root / ".cache"
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get the global settings instance."""
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    """Get the global settings instance (cached singleton)."""
+    return Settings()
 
 
 def reset_settings() -> None:
     """Reset settings (useful for testing)."""
-    global _settings
-    _settings = None
\ No newline at end of file
+    get_settings.cache_clear()
\ No newline at end of file
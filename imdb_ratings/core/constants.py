@@ -18,6 +18,7 @@ LOG_FORMAT_DETAILED = (
 )
 LOG_FORMAT_CONSOLE = "%(asctime)s - %(levelname)s - %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_FILE_BUFFER_CAPACITY = 1024  # records buffered before the log file is written
 
 # =============================================================================
 # Database Connection
@@ -25,13 +26,21 @@ LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 DB_MAX_RETRIES = 3
 DB_RETRY_DELAY = 1.0  # seconds, base delay for exponential backoff
+DB_WRITE_RETRIES = 3  # retries after the first attempt for a write that hit a 429, 5xx or dropped connection
+# PostgREST errors that mean the database was briefly unreachable (could not
+# connect, schema cache not loaded, pool acquisition timed out)
+DB_TRANSIENT_ERROR_CODES = ("PGRST000", "PGRST001", "PGRST002", "PGRST003")
+# SQLSTATE classes for connection failures, insufficient resources and operator intervention
+DB_TRANSIENT_SQLSTATE_CLASSES = ("08", "53", "57P")
+DB_IN_FILTER_MAX_VALUES = 500  # keeps "in.(...)" filters well under URL length limits
+REVIEW_FLUSH_TITLES = 100  # scraped titles whose reviews are upserted together
+POSTGRES_MAX_PARAMETERS = 65535  # bind-parameter limit; caps rows x columns per write
 
 # =============================================================================
 # IMDB ID Formatting
 # =============================================================================
 
 IMDB_TITLE_ID_PREFIX = "tt"
-IMDB_TITLE_ID_FORMAT = "tt{:07d}"
 IMDB_REVIEW_ID_PREFIX = "rw"
 
 # =============================================================================
@@ -45,6 +54,12 @@ IMDB_GRAPHQL_HEADERS = {
     "x-imdb-user-language": "en-US",
 }
 
+# Headers sent with every GraphQL request
+IMDB_GRAPHQL_REQUEST_HEADERS = {
+    "accept": "application/graphql+json, application/json",
+    "content-type": "application/json",
+}
+
 IMDB_GRAPHQL_OPERATION_NAME = "TitleReviewsRefine"
 IMDB_GRAPHQL_PERSISTED_QUERY_HASH = "fb58a77d474033025bf28e1fe68f9b998111d3df58e08cd8405bd9265b1a9aff"
 IMDB_GRAPHQL_PAGE_SIZE = 50
@@ -73,12 +88,21 @@ RATE_LIMIT_MAX_WAIT_SECONDS = 300
 
 OMDB_BASE_URL = "http://www.omdbapi.com/"
 OMDB_REQUEST_TIMEOUT = 10  # seconds
+OMDB_MAX_WORKERS = 4  # concurrent OMDB lookups
+OMDB_MAX_IN_FLIGHT = 2 * OMDB_MAX_WORKERS  # lookups submitted ahead of the consumer
+OMDB_RETRY_TOTAL = 3
+OMDB_RETRY_BACKOFF_FACTOR = 0.5
+OMDB_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
 # =============================================================================
 # IMDB Data Processing
 # =============================================================================
 
 IMDB_RATING_MULTIPLIER = 10  # converts 0.0-10.0 scale to 0-100 integer scale
+IMDB_DATASET_REQUEST_TIMEOUT = 60  # seconds
+IMDB_DATASET_CHUNK_SIZE = 1 << 20  # bytes read per chunk when caching a dataset
+IMDB_TITLES_SNAPSHOT_NAME = "titles.parquet"  # processed titles, reused while the datasets are unchanged
+IMDB_TITLES_SNAPSHOT_VERSION = 1  # bump when title processing (code, dtypes or constants) changes its output
 
 # =============================================================================
 # Title Update Thresholds
@@ -119,3 +143,5 @@ VALID_GENRES = (
     "War",
     "Western",
 )
+
+VALID_GENRES_SET: frozenset[str] = frozenset(VALID_GENRES)
@@ -5,9 +5,9 @@ This module provides a singleton connection manager to ensure efficient
 database connection reuse throughout the application lifecycle.
 """
 
-from typing import Self, Any
+from typing import Any
 from threading import Lock
-from supabase import Client, create_client
+from supabase import Client, ClientOptions, create_client
 from imdb_ratings import logger
 from imdb_ratings.core.config import get_settings
 from imdb_ratings.core.constants import DB_MAX_RETRIES, DB_RETRY_DELAY
@@ -20,29 +20,18 @@ class DatabaseConnectionManager:
 
     This class ensures that only one Supabase client is created and reused
     throughout the application's lifecycle, preventing connection exhaustion
-    and improving performance.
+    and improving performance. The single instance is the module-level
+    ``_connection_manager``; use get_database_client() rather than
+    instantiating this class directly.
     """
 
-    _instance: Self | None = None
     _lock: Lock = Lock()
     _client: Client | None = None
     _max_retries: int = DB_MAX_RETRIES
     _retry_delay: float = DB_RETRY_DELAY
 
-    def __new__(cls) -> Self:
-        """Ensure only one instance of the connection manager exists."""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
-    
     def __init__(self) -> None:
         """Initialize the connection manager."""
-        if hasattr(self, "_initialized"):
-            return
-        
-        self._initialized = True
         try:
             self._settings = get_settings()
             self._validate_configuration()
@@ -63,6 +52,10 @@ class DatabaseConnectionManager:
         """
         Get the Supabase client instance, creating it if necessary.
 
+        The connection is tested once when the client is created; use
+        health_check() to verify an existing connection explicitly, and
+        reconnect() to replace a client after a connection-level failure.
+
         Returns:
             Supabase client instance
         """
@@ -70,16 +63,29 @@ class DatabaseConnectionManager:
             with self._lock:
                 if self._client is None:
                     self._client = self._create_client_with_retry()
+        return self._client
 
-        try:
-            # check connection exists
-            self._verify_connection()
-        except Exception:
-            logger.warning("Connection verification failed. Attempting to reconnect...")
-            with self._lock:
+    def reconnect(self, failed_client: Client | None = None) -> Client:
+        """
+        Replace the cached client with a newly created and tested one.
+
+        Args:
+            failed_client: The client that hit the failure. If another caller
+                has already replaced it, the current client is returned as is,
+                so concurrent workers reconnect only once.
+
+        Returns:
+            Supabase client instance
+
+        Raises:
+            DatabaseConnectionError: If a new connection cannot be established
+        """
+        with self._lock:
+            if failed_client is None or self._client is failed_client or self._client is None:
+                logger.info("Reconnecting Supabase client")
                 self._client = None
                 self._client = self._create_client_with_retry()
-        return self._client
+            return self._client
     
     def _create_client_with_retry(self) -> Client:
         """Create a Supabase client with retry logic."""
@@ -91,7 +97,11 @@ class DatabaseConnectionManager:
                 
                 client = create_client(
                     self._settings.supabase.project_url,
-                    self._settings.supabase.secret_key
+                    self._settings.supabase.secret_key,
+                    options=ClientOptions(
+                        schema=self._settings.supabase.schema_name,
+                        postgrest_client_timeout=self._settings.supabase.request_timeout,
+                    )
                 )
 
                 # Test the connection
@@ -154,9 +164,8 @@ class DatabaseConnectionManager:
         """
         with self._lock:
             self._client = None
-            DatabaseConnectionManager._instance = None
-            if hasattr(self, "_initialized"):
-                delattr(self, "_initialized")
+            self._settings = get_settings()
+            self._validate_configuration()
 
     def health_check(self) -> dict[str, Any]:
         """
@@ -173,7 +182,11 @@ class DatabaseConnectionManager:
         }
         
         try:
-            self._verify_connection()
+            try:
+                self._verify_connection()
+            except DatabaseConnectionError as e:
+                logger.warning(f"Connection verification failed: {e}. Attempting to reconnect...")
+                self.reconnect()
             health_status["status"] = "healthy"
             health_status["connected"] = True
         except Exception as e:
@@ -183,6 +196,11 @@ class DatabaseConnectionManager:
         
         return health_status
 
+
+# The single connection manager instance shared by the whole process
+_connection_manager = DatabaseConnectionManager()
+
+
 def get_database_client() -> Client:
     """
     Get the shared database client.
@@ -197,23 +215,26 @@ def get_database_client() -> Client:
         DatabaseConnectionError: If the connection fails
         ConfigurationError: If the configuration is invalid
     """
-    try:
-        manager = DatabaseConnectionManager()
-        return manager.get_client()
-    except Exception as e:
-        logger.error(f"Failed to get database client: {e}")
-        raise
+    return _connection_manager.get_client()
 
-# Create a module-level instance for easy cleanup
-_connection_manager = DatabaseConnectionManager()
+def reconnect_database_client(failed_client: Client | None = None) -> Client:
+    """
+    Replace the shared database client after a connection-level failure.
 
+    Args:
+        failed_client: The client that hit the failure (see DatabaseConnectionManager.reconnect)
+
+    Returns:
+        Supabase client instance
+
+    Raises:
+        DatabaseConnectionError: If the connection fails
+    """
+    return _connection_manager.reconnect(failed_client)
 
 def close_database_connection() -> None:
     """Close the database connection when shutting down."""
-    try:
-        _connection_manager.close()
-    except Exception as e:
-        logger.error(f"Error during database connection cleanup: {e}")
+    _connection_manager.close()
 
 def get_database_health() -> dict[str, Any]:
     """Get the health status of the database connection."""
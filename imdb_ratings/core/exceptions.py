@@ -22,7 +22,10 @@ class ScrapingError(IMDBRatingsError):
 
 class RateLimitError(ScrapingError):
     """Raised when we hit rate limits."""
-    pass
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after  # seconds requested by the server, if given
 
 class DataValidationError(ScrapingError):
     """Raised when scraped data doesn't match expected format."""
@@ -1,4 +1,7 @@
+import atexit
 import logging
+import queue
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
 
 from imdb_ratings.core.config import get_settings
@@ -7,8 +10,18 @@ from imdb_ratings.core.constants import (
     LOG_FORMAT_DETAILED,
     LOG_FORMAT_CONSOLE,
     LOG_DATE_FORMAT,
+    LOG_FILE_BUFFER_CAPACITY,
 )
 
+# No log format uses process or thread attributes, so skip collecting them per record
+logging.logProcesses = False
+logging.logThreads = False
+logging.logMultiprocessing = False
+
+# Formatters are stateless, so build them once per process
+_DETAILED_FORMATTER = logging.Formatter(LOG_FORMAT_DETAILED, datefmt=LOG_DATE_FORMAT)
+_CONSOLE_FORMATTER = logging.Formatter(LOG_FORMAT_CONSOLE, datefmt=LOG_DATE_FORMAT)
+
 def setup_logging(
     log_file: Path | None = None,
     console_level: int | None = None,
@@ -18,7 +31,8 @@ def setup_logging(
     Configure logging for the IMDB scraper application.
     
     This function creates a logger that can write to both console and file,
-    with different logging levels for each if desired.
+    with different logging levels for each if desired. Records are handed
+    to a QueueListener thread so callers never block on console/file I/O.
     
     Args:
         log_file: Path to log file (uses config default if None)
@@ -44,18 +58,11 @@ def setup_logging(
     if logger.handlers:
         return logger
         
-    detailed_formatter = logging.Formatter(
-        LOG_FORMAT_DETAILED, datefmt=LOG_DATE_FORMAT
-    )
-    console_formatter = logging.Formatter(
-        LOG_FORMAT_CONSOLE, datefmt=LOG_DATE_FORMAT
-    )
-    
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(console_level)
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(_CONSOLE_FORMATTER)
+    handlers: list[logging.Handler] = [console_handler]
     
     # File handler
     if log_file:            
@@ -64,7 +71,28 @@ def setup_logging(
 
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(file_level)
-        file_handler.setFormatter(detailed_formatter)
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(_DETAILED_FORMATTER)
+
+        # Buffer file records so they are written in chunks; errors flush immediately
+        buffered_file_handler = MemoryHandler(
+            capacity=LOG_FILE_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        buffered_file_handler.setLevel(file_level)
+        handlers.append(buffered_file_handler)
+
+        # atexit runs in reverse order: the listener drains, then the buffer is
+        # flushed into the file handler, then the log file is closed
+        atexit.register(file_handler.close)
+        atexit.register(buffered_file_handler.close)
+
+    # The logger only enqueues records; the listener thread does the writes
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     
-    return logger
\ No newline at end of file
+    return logger
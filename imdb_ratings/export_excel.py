@@ -38,32 +38,37 @@ def export_to_excel(file_path: Path | None = None, supabase_client: Client | Non
     title_repo = TitleRepository(supabase_client)
     titles_df = title_repo.get_all_as_dataframe()
 
+    title_columns = ["id", "primaryTitle", "genres", "startYear", "endYear", "imdb_rating", "isMovie"]
+
+    # Project both sides before the join so only exported columns are hashed
     combined_df = (
-        titles_df
-        .filter(pl.col("firstWorld") == True)
-        .join(weighted_ratings_df, on="id", how="inner")
-        .sort('weighted_rating', descending=True)
-        .drop_nulls("weighted_rating")
+        titles_df.lazy()
+        .filter(pl.col("firstWorld"))
+        .select(title_columns)
+        .join(
+            weighted_ratings_df.lazy()
+            .select(["id", "weighted_rating"])
+            .drop_nulls("weighted_rating"),
+            on="id",
+            how="inner"
+        )
+        .sort("weighted_rating", descending=True)
+        .collect()
     )
 
     logger.info(f"Processing {len(combined_df)} titles for export")
 
-    export_columns = ["id", "primaryTitle", "genres", "startYear", "endYear", "imdb_rating", "isMovie", "weighted_rating"]
+    # Split movies and shows in a single pass; maintain_order keeps the rating sort
+    partitions = combined_df.partition_by("isMovie", as_dict=True, include_key=False)
+    empty_df = combined_df.clear().drop("isMovie")
 
     movies_df = (
-        combined_df
-        .select(export_columns)
-        .filter(pl.col("isMovie"))
-        .drop(["isMovie", "endYear", "id"])
+        partitions.get((True,), empty_df)
+        .drop(["endYear", "id"])
         .rename({"startYear": "year"})
     )
 
-    shows_df = (
-        combined_df
-        .select(export_columns)
-        .filter(~pl.col("isMovie"))
-        .drop(["isMovie", "id"])
-    )
+    shows_df = partitions.get((False,), empty_df).drop("id")
 
     logger.info(f"Exporting {len(movies_df)} movies and {len(shows_df)} shows")
 
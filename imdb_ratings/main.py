@@ -11,20 +11,9 @@ This script orchestrates the complete update pipeline:
 
 import argparse
 import sys
-import atexit
-from imdb_ratings.updater.update_titles import update_title_table
-from imdb_ratings.updater.update_first_world import update_first_world_status
-from imdb_ratings.updater.update_reviews import update_reviews_table
-from imdb_ratings.updater.update_weighted_ratings import update_weighted_ratings_table
-from imdb_ratings.export_excel import export_to_excel
-from imdb_ratings.core.database import close_database_connection, get_database_client
-from imdb_ratings import logger
 
 
-atexit.register(close_database_connection)
-
-
-def main(skip_titles: bool=False, skip_reviews: bool=False, skip_ratings: bool=False, skip_export: bool=False) -> None:
+def main(skip_titles: bool=False, skip_reviews: bool=False, skip_ratings: bool=False, skip_export: bool=False, force_refresh: bool=False) -> None:
     """
     Main update process.
 
@@ -33,7 +22,18 @@ def main(skip_titles: bool=False, skip_reviews: bool=False, skip_ratings: bool=F
         skip_reviews: Skip updating reviews table
         skip_ratings: Skip updating weighted ratings table
         skip_export: Skip Excel export
+        force_refresh: Re-download the IMDB datasets even if the local cache is current
     """
+    # Pipeline imports pull in polars, supabase and the settings/logging setup,
+    # so they are deferred until a run actually starts (keeps --help instant)
+    from imdb_ratings.updater.update_titles import update_title_table
+    from imdb_ratings.updater.update_first_world import update_first_world_status
+    from imdb_ratings.updater.update_reviews import update_reviews_table
+    from imdb_ratings.updater.update_weighted_ratings import update_weighted_ratings_table
+    from imdb_ratings.export_excel import export_to_excel
+    from imdb_ratings.core.database import close_database_connection, get_database_client
+    from imdb_ratings import logger
+
     logger.info("Starting IMDB ratings update process")
 
     try:
@@ -42,7 +42,7 @@ def main(skip_titles: bool=False, skip_reviews: bool=False, skip_ratings: bool=F
         # Step 1: Download and update titles from IMDB
         if not skip_titles:
             logger.info("Step 1: Updating titles table")
-            update_title_table(supabase_client)
+            update_title_table(supabase_client, force_refresh=force_refresh)
         else:
             logger.info("Step 1: Skipping titles update")
 
@@ -70,7 +70,7 @@ def main(skip_titles: bool=False, skip_reviews: bool=False, skip_ratings: bool=F
         # Step 5: Export to Excel
         if not skip_export:
             logger.info("Step 5: Exporting to Excel")
-            export_to_excel()
+            export_to_excel(supabase_client=supabase_client)
         else:
             logger.info("Step 5: Skipping Excel export")
 
@@ -125,6 +125,12 @@ def parse_args():
         help="Skip Excel export"
     )
 
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="Re-download the IMDB datasets even if the local cache is current"
+    )
+
     return parser.parse_args()
 
 
@@ -134,5 +140,6 @@ if __name__ == "__main__":
         skip_titles=args.skip_titles,
         skip_reviews=args.skip_reviews,
         skip_ratings=args.skip_ratings,
-        skip_export=args.skip_export
+        skip_export=args.skip_export,
+        force_refresh=args.force_refresh
     )
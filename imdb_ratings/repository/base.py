@@ -2,12 +2,34 @@
 Base repository class for database operations.
 """
 
+import io
+import math
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from itertools import chain
+from typing import Any, Callable, Iterable, TypeVar
+import httpx
+import polars as pl
+from postgrest import APIError
 from supabase import Client
 from imdb_ratings import logger
 from imdb_ratings.core.config import get_settings
+from imdb_ratings.core.constants import (
+    DB_IN_FILTER_MAX_VALUES,
+    DB_RETRY_DELAY,
+    DB_TRANSIENT_ERROR_CODES,
+    DB_TRANSIENT_SQLSTATE_CLASSES,
+    DB_WRITE_RETRIES,
+    HTTP_STATUS_RATE_LIMITED,
+    POSTGRES_MAX_PARAMETERS,
+    RATE_LIMIT_MAX_WAIT_SECONDS,
+)
+from imdb_ratings.core.database import reconnect_database_client
 from imdb_ratings.core.exceptions import DatabaseOperationError
+from imdb_ratings.utils import parse_retry_after
+
+T = TypeVar("T")
 
 class BaseRepository(ABC):
     """Base class for all repositories."""
@@ -29,75 +51,362 @@ class BaseRepository(ABC):
         """Return the table name for the repository."""
         pass
 
-    def fetch_all(self, columns: str = "*") -> list[dict[str, Any]]:
+    @property
+    def key_column(self) -> str:
+        """Return the unique, ordered column used for keyset pagination."""
+        return "id"
+
+    def fetch_all_columnar(
+        self,
+        schema: pl.Schema,
+        eq_filters: dict[str, Any] | None = None,
+        is_filters: dict[str, Any] | None = None
+    ) -> pl.DataFrame:
         """
-        Fetch all records from the table.
+        Fetch all records matching server-side filters into a DataFrame with a known schema.
+
+        Only the schema's columns are selected, and each page's JSON body is
+        parsed straight into columns by Polars instead of into Python dicts.
+        Pages are read with keyset pagination on key_column, and results larger
+        than one batch are fetched concurrently (see _fetch_pages).
 
         Args:
-            columns: Columns to select (default: "*")
+            schema: Column names and dtypes to fetch, including key_column.
+            eq_filters: Column values to match with equality
+            is_filters: Column values to match with IS (None, True or False)
 
         Returns:
-            List of records as dictionaries.
+            DataFrame with exactly the given schema, ordered by key_column.
         """
-
-        all_data: list[dict[str, Any]] = []
-        offset: int = 0
+        columns = ", ".join(schema.names())
+        filters = (eq_filters or {}, is_filters or {})
 
         logger.info(f"Fetching all data from {self.table_name} table")
 
-        while True:
-            try:
-                batch_data = (
-                    self.client.table(self.table_name)
-                    .select(columns)
-                    .offset(offset)
-                    .limit(self.config.batch_size)
-                    .execute()
-                    .data
+        try:
+            pages = self._fetch_pages(
+                filters,
+                lambda last_key, lower, upper: pl.read_json(
+                    io.BytesIO(self._get_page(self._page_params(columns, filters, last_key, lower, upper)).content),
+                    schema=schema
                 )
+            )
+            df = pl.concat(pages)
+        except Exception as e:
+            logger.error(f"Unexpected error fetching from {self.table_name}: {e}")
+            raise DatabaseOperationError(f"Failed to fetch data: {e}")
 
-                all_data.extend(batch_data)
-                offset += self.config.batch_size
+        logger.info(f"Total records fetched from {self.table_name}: {len(df)}")
+        return df
 
-                logger.debug(f"Fetched {len(all_data)} records so far from {self.table_name}")
+    def _page_params(
+        self,
+        columns: str,
+        filters: tuple[dict[str, Any], dict[str, Any]],
+        last_key: Any,
+        lower: int | None,
+        upper: int | None
+    ) -> list[tuple[str, str]]:
+        """Build the PostgREST query parameters for the page after last_key within [lower, upper)."""
+        params = [
+            ("select", columns),
+            ("order", f"{self.key_column}.asc"),
+            ("limit", str(self.config.batch_size)),
+            *self._filter_params(filters),
+        ]
 
-                # If the batch size is less than the batch size, we've fetched all records
-                if len(batch_data) < self.config.batch_size:
-                    break
-            except Exception as e:
-                logger.error(f"Unexpected error fetching from {self.table_name}: {e}")
-                raise DatabaseOperationError(f"Failed to fetch data: {e}")
+        if last_key is not None:
+            params.append((self.key_column, f"gt.{last_key}"))
+        elif lower is not None:
+            params.append((self.key_column, f"gte.{lower}"))
+        if upper is not None:
+            params.append((self.key_column, f"lt.{upper}"))
+
+        return params
+
+    def _filter_params(self, filters: tuple[dict[str, Any], dict[str, Any]]) -> list[tuple[str, str]]:
+        """Build the PostgREST query parameters for the given (eq, is) filters."""
+        eq_filters, is_filters = filters
+        return [
+            *((key, f"eq.{self._format_filter_value(value)}") for key, value in eq_filters.items()),
+            *((key, f"is.{self._format_filter_value(value)}") for key, value in is_filters.items()),
+        ]
+
+    @staticmethod
+    def _format_filter_value(value: Any) -> str:
+        """Render a filter value the way PostgREST expects it in a query string."""
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return str(value)
+
+    def _get_page(self, params: list[tuple[str, str]]) -> httpx.Response:
+        """GET one page of the table through the PostgREST session, raising on an error status."""
+        response = self.client.postgrest.session.get(f"/{self.table_name}", params=params)
+        response.raise_for_status()
+        return response
+
+    def _fetch_pages(
+        self,
+        filters: tuple[dict[str, Any], dict[str, Any]],
+        fetch_page: Callable[[Any, int | None, int | None], pl.DataFrame]
+    ) -> list[pl.DataFrame]:
+        """
+        Fetch every page matching filters, in key order.
+
+        The first page is read on its own, so results that fit in one batch
+        cost a single request. Larger results are split over the remaining
+        key space into ranges that are fetched concurrently.
+
+        Args:
+            filters: (eq, is) filters to apply to every page.
+            fetch_page: Returns the page after last_key (exclusive) or from
+                lower (inclusive), below upper (exclusive); called as
+                fetch_page(last_key, lower, upper).
+
+        Returns:
+            The pages in key order.
+        """
+        first_page = fetch_page(None, None, None)
+        if len(first_page) < self.config.batch_size:
+            return [first_page]
+
+        first_key, last_key = first_page[self.key_column][0], first_page[self.key_column][-1]
+        key_ranges = self._plan_key_ranges(filters, first_key, last_key)
+
+        if key_ranges is None:
+            return [first_page, *self._fetch_key_range(fetch_page, last_key=last_key)]
+
+        logger.debug(f"Fetching {self.table_name} in {len(key_ranges)} parallel key ranges")
+        with ThreadPoolExecutor(max_workers=len(key_ranges)) as executor:
+            range_pages = executor.map(
+                lambda key_range: self._fetch_key_range(fetch_page, None, *key_range),
+                key_ranges
+            )
+            return [first_page, *chain.from_iterable(range_pages)]
+
+    def _plan_key_ranges(
+        self,
+        filters: tuple[dict[str, Any], dict[str, Any]],
+        first_key: Any,
+        last_key: Any
+    ) -> list[tuple[int, int | None]] | None:
+        """
+        Split the key space after a full first page into ranges for parallel fetching.
+
+        Costs one index probe for the highest matching key; the number of
+        remaining rows is estimated from the key density of the first page
+        instead of counting the filtered set.
+
+        Args:
+            filters: (eq, is) filters applied to every page.
+            first_key: First key_column value of the first page.
+            last_key: Last key_column value of the first page.
+
+        Returns:
+            List of (lower, upper) bounds, upper exclusive and None for the last
+            range, or None if the remaining rows should be fetched serially.
+        """
+        if self.config.max_workers == 1:
+            return None
+        if not isinstance(first_key, int) or not isinstance(last_key, int):
+            return None
+
+        params = [
+            ("select", self.key_column),
+            ("order", f"{self.key_column}.desc"),
+            ("limit", "1"),
+            *self._filter_params(filters),
+        ]
+        high = self._get_page(params).json()[0][self.key_column]
+
+        remaining = (high - last_key) * self.config.batch_size / max(last_key - first_key, 1)
+        num_ranges = min(self.config.max_workers, math.ceil(remaining / self.config.batch_size))
+        if num_ranges <= 1:
+            return None
+
+        step = (high - last_key) // num_ranges + 1
+        bounds = [last_key + 1 + i * step for i in range(num_ranges)]
+
+        return list(zip(bounds, bounds[1:] + [None]))
+
+    def _fetch_key_range(
+        self,
+        fetch_page: Callable[[Any, int | None, int | None], pl.DataFrame],
+        last_key: Any = None,
+        lower: int | None = None,
+        upper: int | None = None
+    ) -> list[pl.DataFrame]:
+        """
+        Fetch the pages after last_key, or from lower, below upper using keyset pagination.
+
+        Args:
+            fetch_page: Page fetcher, as for _fetch_pages.
+            last_key: Exclusive lower bound, or None to use lower.
+            lower: Inclusive lower bound, or None for no bound.
+            upper: Exclusive upper bound, or None for no bound.
+
+        Returns:
+            The pages in key order.
+        """
+        pages: list[pl.DataFrame] = []
+        num_records = 0
+
+        while True:
+            page = fetch_page(last_key, lower, upper)
+            pages.append(page)
+            num_records += len(page)
+
+            logger.debug("Fetched %d records so far from %s", num_records, self.table_name)
 
-        logger.info(f"Total records fetched from {self.table_name}: {len(all_data)}")
-        return all_data
-    
-    def upsert_batch(self, data: list[dict[str, Any]]) -> None:
+            # If the batch size is less than the batch size, we've fetched all records
+            if len(page) < self.config.batch_size:
+                break
+
+            last_key = page[self.key_column][-1]
+
+        return pages
+
+    def upsert_dataframe(self, df: pl.DataFrame) -> None:
         """
-        Upsert data in batches.
+        Upsert a DataFrame in batches without converting rows to Python dicts.
+
+        Each batch is serialized by Polars and posted to PostgREST directly,
+        asking for no response body.
 
         Args:
-            data: list of dictionaries to upsert.
-        """    
-        total_records = len(data)
+            df: DataFrame whose columns match the table.
+        """
+        total_records = len(df)
 
         if total_records == 0:
             logger.warning(f"No data to upsert for {self.table_name}")
             return
-        
+
         logger.info(f"Upserting {total_records} records into {self.table_name} table")
-        total_batches = (total_records + self.config.batch_size - 1) // self.config.batch_size
+        batch_size = self._upsert_batch_size(df.width)
+        batches = df.iter_slices(n_rows=batch_size)
+        self._run_upsert_batches(batches, math.ceil(total_records / batch_size), self._post_upsert_frame)
+
+    def _upsert_batch_size(self, num_columns: int) -> int:
+        """Rows per upsert request, capped so rows x columns stays within Postgres' parameter limit."""
+        return max(1, min(self.config.upsert_batch_size, POSTGRES_MAX_PARAMETERS // max(num_columns, 1)))
+
+    def _run_upsert_batches(
+        self,
+        batches: Iterable[T],
+        total_batches: int,
+        send: Callable[[T, int], None]
+    ) -> None:
+        """
+        Send batches with send(batch, batch_num), concurrently if there are several.
+
+        Batches are pulled from the iterable only as workers free up, so at
+        most max_workers batches are being serialized or sent at any time.
+        """
+        if total_batches == 1:
+            send(next(iter(batches)), 1)
+            return
 
-        for i in range(0, total_records, self.config.batch_size):
-            batch = data[i:i+self.config.batch_size]
-            batch_num = i // self.config.batch_size + 1
+        max_in_flight = min(self.config.max_workers, total_batches)
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            in_flight: dict[Future[None], int] = {}
 
+            for batch_num, batch in enumerate(batches, start=1):
+                if len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                        logger.info("Successfully upserted batch %d of %d", in_flight.pop(future), total_batches)
+                in_flight[executor.submit(send, batch, batch_num)] = batch_num
+
+            for future in as_completed(in_flight):
+                future.result()
+                logger.info("Successfully upserted batch %d of %d", in_flight[future], total_batches)
+
+    def _post_upsert_frame(self, batch_df: pl.DataFrame, batch_num: int) -> None:
+        """POST a DataFrame batch as a merge-duplicates upsert, reporting failures with its batch number."""
+        body = batch_df.write_json()
+
+        def post() -> None:
+            response = self.client.postgrest.session.post(
+                f"/{self.table_name}",
+                content=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Prefer": "resolution=merge-duplicates,return=minimal",
+                }
+            )
+            response.raise_for_status()
+
+        try:
+            self._retry_transient(post)
+        except Exception as e:
+            logger.error("Error upserting batch %d into %s: %s", batch_num, self.table_name, e)
+            raise DatabaseOperationError(f"Failed to upsert batch {batch_num}: {str(e)}")
+
+    def _retry_transient(self, operation: Callable[[], T]) -> T:
+        """
+        Run operation, retrying after a 429 or 5xx response or a dropped connection.
+
+        Concurrent writers can briefly exhaust the database's connection
+        slots or hit the API gateway's rate limit; such failures are retried
+        up to DB_WRITE_RETRIES times after the first attempt, with exponential
+        backoff (or the server's Retry-After, if longer, capped at
+        RATE_LIMIT_MAX_WAIT_SECONDS), before being raised.
+        Successful writes are never delayed.
+
+        After a failure to connect or a broken connection, the shared client
+        is replaced (see reconnect_database_client) before the retry, so
+        operation must look up self.client each time it runs.
+        """
+        for attempt in range(DB_WRITE_RETRIES):
             try:
-                self.client.table(self.table_name).upsert(batch).execute()
-                if total_batches > 1:
-                    logger.info(f"Successfully upserted batch {batch_num} of {total_batches}")
-            except Exception as e:
-                logger.error(f"Error upserting batch {batch_num} into {self.table_name}: {str(e)}")
-                raise DatabaseOperationError(f"Failed to upsert batch {batch_num}: {str(e)}")
+                return operation()
+            except (httpx.TransportError, httpx.HTTPStatusError, APIError) as e:
+                delay = self._transient_error_delay(e, attempt)
+                if delay is None:
+                    raise
+                logger.warning("Transient error writing to %s, retrying in %s seconds: %s", self.table_name, delay, e)
+                time.sleep(delay)
+                if isinstance(e, (httpx.ConnectError, httpx.RemoteProtocolError)):
+                    self.client = reconnect_database_client(self.client)
+
+        return operation()
+
+    @staticmethod
+    def _transient_error_delay(
+        error: httpx.TransportError | httpx.HTTPStatusError | APIError,
+        attempt: int
+    ) -> float | None:
+        """
+        Seconds to wait before retrying after error, or None if it is not transient.
+
+        postgrest's execute() raises APIError rather than HTTPStatusError.
+        PostgREST's own JSON errors carry a PGRST or SQLSTATE code instead of
+        the HTTP status, while non-JSON responses (e.g. from the gateway)
+        carry the 3-digit status itself.
+        """
+        delay = DB_RETRY_DELAY * (2 ** attempt)
+
+        if isinstance(error, httpx.TransportError):
+            return delay
+
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            if status_code == HTTP_STATUS_RATE_LIMITED:
+                retry_after = parse_retry_after(error.response.headers.get("Retry-After")) or 0.0
+                return min(max(delay, retry_after), RATE_LIMIT_MAX_WAIT_SECONDS)
+            return delay if status_code >= 500 else None
+
+        code = str(error.code or "")
+        if len(code) == 3 and code.isdigit():
+            status_code = int(code)
+            return delay if status_code == HTTP_STATUS_RATE_LIMITED or status_code >= 500 else None
+        if code in DB_TRANSIENT_ERROR_CODES or code.startswith(DB_TRANSIENT_SQLSTATE_CLASSES):
+            return delay
+        return None
 
     def update(self, data: dict[str, Any], filters: dict[str, Any]) -> None:
         """
@@ -107,13 +416,37 @@ class BaseRepository(ABC):
             data: Data to update.
             filters: Filter conditions (using equality)
         """
-        query = self.client.table(self.table_name).update(data)
-
-        for key, value in filters.items():
-            query = query.eq(key, value)
+        def execute() -> None:
+            query = self.client.table(self.table_name).update(data)
+            for key, value in filters.items():
+                query = query.eq(key, value)
+            query.execute()
 
         try:
-            query.execute()
+            self._retry_transient(execute)
         except Exception as e:
-            logger.error(f"Error updating {self.table_name} table: {str(e)}")
-            raise DatabaseOperationError(f"Failed to update {self.table_name}: {str(e)}")
\ No newline at end of file
+            logger.error("Error updating %s table: %s", self.table_name, e)
+            raise DatabaseOperationError(f"Failed to update {self.table_name}: {str(e)}")
+
+    def update_in(self, data: dict[str, Any], column: str, values: list[Any]) -> None:
+        """
+        Update all records whose column value is in values.
+
+        Values are sent in chunks of DB_IN_FILTER_MAX_VALUES, one request each;
+        transient failures of a chunk are retried (see _retry_transient).
+
+        Args:
+            data: Data to update.
+            column: Column to filter on.
+            values: Values to match.
+        """
+        for i in range(0, len(values), DB_IN_FILTER_MAX_VALUES):
+            chunk = values[i:i + DB_IN_FILTER_MAX_VALUES]
+
+            try:
+                self._retry_transient(
+                    lambda: self.client.table(self.table_name).update(data).in_(column, chunk).execute()
+                )
+            except Exception as e:
+                logger.error("Error updating %s table: %s", self.table_name, e)
+                raise DatabaseOperationError(f"Failed to update {self.table_name}: {str(e)}")
@@ -11,6 +11,10 @@ class ReviewRepository(BaseRepository):
     @property
     def table_name(self) -> str:
         return self.config.reviews_table
+
+    @property
+    def key_column(self) -> str:
+        return "review_id"
     
     def upsert_reviews(self, reviews_df: pl.DataFrame) -> None:
         """
@@ -22,5 +26,4 @@ class ReviewRepository(BaseRepository):
         if reviews_df.is_empty():
             return
         
-        data = reviews_df.to_dicts()
-        self.upsert_batch(data)
\ No newline at end of file
+        self.upsert_dataframe(reviews_df)
\ No newline at end of file
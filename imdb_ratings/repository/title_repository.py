@@ -5,6 +5,25 @@ import polars as pl
 from imdb_ratings.repository.base import BaseRepository
 from imdb_ratings import logger
 
+TITLES_SCHEMA = pl.Schema({
+    "id": pl.Int64,
+    "isMovie": pl.Boolean,
+    "primaryTitle": pl.String,
+    "startYear": pl.Int16,
+    "endYear": pl.Int16,
+    "genres": pl.List(pl.String),
+    "imdb_rating": pl.Int16,
+    "num_votes": pl.Int64,
+    "needsUpdate": pl.Boolean,
+    "firstWorld": pl.Boolean,
+})
+
+# Schema for queries that only need title IDs
+TITLE_IDS_SCHEMA = pl.Schema({"id": pl.Int64})
+
+# Schema for comparing stored vote counts against a fresh IMDB download
+TITLE_VOTES_SCHEMA = pl.Schema({"id": pl.Int64, "num_votes": pl.Int64})
+
 class TitleRepository(BaseRepository):
     """Repository for managing title data in Supabase."""
 
@@ -19,8 +38,16 @@ class TitleRepository(BaseRepository):
         Returns:
             DataFrame containing all titles.
         """
-        data = self.fetch_all()
-        return pl.DataFrame(data, infer_schema_length=None)
+        return self.fetch_all_columnar(TITLES_SCHEMA)
+
+    def get_vote_counts(self) -> pl.DataFrame:
+        """
+        Get the stored vote count of every title.
+
+        Returns:
+            DataFrame with id and num_votes columns.
+        """
+        return self.fetch_all_columnar(TITLE_VOTES_SCHEMA)
     
     def get_titles_needing_update(self) -> list[int]:
         """
@@ -29,36 +56,19 @@ class TitleRepository(BaseRepository):
         Returns:
             List of title IDs marked as needing update.
         """
-        # Supabase columns argument is a string of comma-separated column names
-        data = self.fetch_all(columns="id, needsUpdate, firstWorld")
-        df = pl.DataFrame(data, infer_schema_length=None)
-
-        if df.is_empty():
-            return []
-        
-        return (
-            df.filter(pl.col("needsUpdate") & pl.col("firstWorld"))
-            .select("id")
-            .to_series()
-            .to_list()
+        ids = self.fetch_all_columnar(
+            TITLE_IDS_SCHEMA,
+            eq_filters={"needsUpdate": True, "firstWorld": True}
         )
+        return ids["id"].to_list()
     
     def get_titles_needing_first_world_update(self) -> list[int]:
         """
-        Get IDs of titles that need firstWorld updates.
+        Get IDs of titles that need firstWorld updates, in ascending order.
         """
-        data = self.fetch_all(columns="id, firstWorld")
-        df = pl.DataFrame(data, infer_schema_length=None)
-
-        if df.is_empty():
-            return []
-        
-        return sorted(
-            df.filter(pl.col("firstWorld").is_null())
-            .select("id")
-            .to_series()
-            .to_list()
-        )
+        # fetch_all_columnar pages in id order, so the result is already sorted
+        ids = self.fetch_all_columnar(TITLE_IDS_SCHEMA, is_filters={"firstWorld": None})
+        return ids["id"].to_list()
     
     def mark_titles_updated(self, title_id: int) -> None:
         """
@@ -71,7 +81,42 @@ class TitleRepository(BaseRepository):
             data={"needsUpdate": False},
             filters={"id": title_id}
         )
-        logger.debug(f"Marked title {title_id} as updated")
+        logger.debug("Marked title %s as updated", title_id)
+
+    def mark_titles_updated_bulk(self, title_ids: list[int]) -> None:
+        """
+        Mark several titles as no longer needing update.
+
+        Args:
+            title_ids: IDs of the titles to mark as updated.
+        """
+        if not title_ids:
+            return
+
+        self.update_in(
+            data={"needsUpdate": False},
+            column="id",
+            values=title_ids
+        )
+        logger.debug("Marked %d titles as updated", len(title_ids))
+
+    def set_first_world_bulk(self, title_ids: list[int], first_world: bool) -> None:
+        """
+        Set firstWorld to the same value for several titles.
+
+        Args:
+            title_ids: IDs of the titles to update.
+            first_world: Value to store in firstWorld.
+        """
+        if not title_ids:
+            return
+
+        self.update_in(
+            data={"firstWorld": first_world},
+            column="id",
+            values=title_ids
+        )
+        logger.debug("Set firstWorld=%s for %d titles", first_world, len(title_ids))
 
     def upsert_titles(self, titles_df: pl.DataFrame) -> None:
         """
@@ -80,5 +125,4 @@ class TitleRepository(BaseRepository):
         Args:
             titles_df: DataFrame containing title data.
         """
-        data = titles_df.to_dicts()
-        self.upsert_batch(data)
\ No newline at end of file
+        self.upsert_dataframe(titles_df)
\ No newline at end of file
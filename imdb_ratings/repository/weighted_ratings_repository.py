@@ -4,6 +4,11 @@ Repository for weighted ratings database operations.
 import polars as pl
 from imdb_ratings.repository.base import BaseRepository
 
+WEIGHTED_RATINGS_SCHEMA = pl.Schema({
+    "id": pl.Int64,
+    "weighted_rating": pl.Int16,
+})
+
 
 class WeightedRatingsRepository(BaseRepository):
     """Repository for managing weighted ratings data in Supabase."""
@@ -19,12 +24,4 @@ class WeightedRatingsRepository(BaseRepository):
         Returns:
             DataFrame with proper schema for weighted ratings
         """
-        data = self.fetch_all()
-        
-        return pl.DataFrame(
-            data, 
-            schema=pl.Schema({
-                "id": pl.Int64,
-                "weighted_rating": pl.Int16,
-            })
-        )
\ No newline at end of file
+        return self.fetch_all_columnar(WEIGHTED_RATINGS_SCHEMA)
\ No newline at end of file
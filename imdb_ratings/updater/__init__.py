@@ -1,14 +1,27 @@
 """
 IMDB ratings updater module.
+
+Pipeline steps are imported on first access (PEP 562), so importing one
+step does not load the others and their dependencies.
 """
-from .update_titles import update_title_table
-from .update_first_world import update_first_world_status
-from .update_reviews import update_reviews_table
-from .update_weighted_ratings import update_weighted_ratings_table
-
-__all__ = [
-    "update_title_table",
-    "update_first_world_status",
-    "update_reviews_table",
-    "update_weighted_ratings_table",
-]
+from importlib import import_module
+from typing import Any
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "update_title_table": "update_titles",
+    "update_first_world_status": "update_first_world",
+    "update_reviews_table": "update_reviews",
+    "update_weighted_ratings_table": "update_weighted_ratings",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import a pipeline step from its submodule on first access."""
+    if name in _EXPORTS:
+        value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,28 @@
-from .imdb_dataset import IMDBDataProcessor, download_titles_from_imdb
-from .scrape_reviews import create_requests_session, get_reviews_from_title_code
-from .omdb_client import OMDBClient
-
-__all__ = [
-    "IMDBDataProcessor",
-    "download_titles_from_imdb",
-    "create_requests_session",
-    "get_reviews_from_title_code",
-    "OMDBClient",
-]
+"""
+Data sources used by the updater pipeline steps.
+
+Sources are imported on first access (PEP 562), so using one source does
+not load the others and their dependencies.
+"""
+from importlib import import_module
+from typing import Any
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "IMDBDataProcessor": "imdb_dataset",
+    "download_titles_from_imdb": "imdb_dataset",
+    "create_requests_session": "scrape_reviews",
+    "get_reviews_from_title_code": "scrape_reviews",
+    "OMDBClient": "omdb_client",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import a source from its submodule on first access."""
+    if name in _EXPORTS:
+        value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,26 +5,48 @@ This module handles downloading and processing IMDB's public datasets to create
 a curated database of movies and TV shows with significant user engagement.
 """
 
+import hashlib
+import io
+import json
+import shutil
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
 import polars as pl
+import requests
 from imdb_ratings import logger
 from imdb_ratings.core.config import get_settings, IMDBDataConfig
-from imdb_ratings.core.constants import IMDB_TITLE_ID_PREFIX, IMDB_RATING_MULTIPLIER, VALID_GENRES
+from imdb_ratings.utils import write_file_atomic
+from imdb_ratings.core.constants import (
+    IMDB_TITLE_ID_PREFIX,
+    IMDB_RATING_MULTIPLIER,
+    IMDB_DATASET_REQUEST_TIMEOUT,
+    IMDB_DATASET_CHUNK_SIZE,
+    IMDB_TITLES_SNAPSHOT_NAME,
+    IMDB_TITLES_SNAPSHOT_VERSION,
+    VALID_GENRES_SET,
+)
 
 
 class IMDBDataProcessor:
     """Handles downloading and processing of IMDB datasets."""
 
-    def __init__(self, config: IMDBDataConfig | None = None):
+    def __init__(self, config: IMDBDataConfig | None = None, force_refresh: bool = False):
         """
         Initialize the data processor.
 
         Args:
             config: Configuration object. If None, uses default configuration.
+            force_refresh: Download the datasets even if the cached copies are current.
         """
+        settings = get_settings()
         if config is None:
-            settings = get_settings()
             config = settings.imdb
         self.config = config
+        self.cache_dir = settings.cache_dir_path
+        self.force_refresh = force_refresh
 
     def download_title_df(self) -> pl.DataFrame:
         """
@@ -33,13 +55,28 @@ class IMDBDataProcessor:
         logger.info("Starting IMDB data download and processing")
 
         try:
-            basics_df = self._download_basics_data()
+            # The two downloads are independent, so let their transfers overlap
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                basics_path, ratings_path = executor.map(
+                    self._download_to_cache,
+                    (self.config.basics_url, self.config.ratings_url)
+                )
+
+            # Reuse the processed titles if neither dataset nor the config changed
+            snapshot_key = self._snapshot_key(basics_path, ratings_path)
+            result_df = self._read_snapshot(snapshot_key)
+            if result_df is not None:
+                logger.info(f"Datasets unchanged, loaded {len(result_df):,} processed titles from cache")
+                return result_df
+
+            basics_df = self._scan_basics_data(basics_path)
             basics_df = self._process_basics_data(basics_df)
 
-            ratings_df = self._download_ratings_data()
+            ratings_df = self._scan_ratings_data(ratings_path)
             ratings_df = self._process_ratings_data(ratings_df)
 
-            result_df = self._join_title_and_ratings(basics_df, ratings_df)
+            result_df = self._join_title_and_ratings(basics_df, ratings_df).collect(streaming=True)
+            self._write_snapshot(result_df, snapshot_key)
 
             logger.info(f"Successfully processed {len(result_df):,} titles")
             return result_df
@@ -48,33 +85,136 @@ class IMDBDataProcessor:
             logger.error(f"Failed to download and process IMDB data: {e}")
             raise
 
-    def _download_basics_data(self) -> pl.DataFrame:
-        """Download raw title basics data from IMDB."""
-        logger.info(f"Fetching basic title data from {self.config.basics_url}")
+    def _download_to_cache(self, url: str) -> Path:
+        """
+        Download a gzipped dataset and store it decompressed in the local cache.
+
+        The cached file is reused while it is younger than cache_max_age_hours.
+        After that the download is conditional on the ETag/Last-Modified seen
+        last time, so an unchanged dataset costs a single 304 response.
+
+        Args:
+            url: URL of the .tsv.gz dataset
+
+        Returns:
+            Path to the decompressed TSV file
+        """
+        path = self.cache_dir / url.rsplit("/", 1)[-1].removesuffix(".gz")
+        validators_path = path.with_name(path.name + ".validators.json")
+        max_age_seconds = self.config.cache_max_age_hours * 3600
+        headers: dict[str, str] = {}
+
+        if path.exists() and not self.force_refresh:
+            if time.time() - path.stat().st_mtime < max_age_seconds:
+                logger.info(f"Using cached {path.name}")
+                return path
+
+            if validators_path.exists():
+                validators = json.loads(validators_path.read_text())
+                if validators.get("etag"):
+                    headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    headers["If-Modified-Since"] = validators["last_modified"]
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_name(path.name + ".part")
+
+        # Decompress while streaming so the TSV never sits fully in memory
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        with requests.get(url, headers=headers, stream=True, timeout=IMDB_DATASET_REQUEST_TIMEOUT) as response:
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                logger.info(f"{path.name} is unchanged on the server, using cached copy")
+                path.touch()
+                return path
+
+            response.raise_for_status()
+            logger.info(f"Downloading {url} to {path}")
+            with partial_path.open("wb") as f:
+                for chunk in response.iter_content(chunk_size=IMDB_DATASET_CHUNK_SIZE):
+                    f.write(decompressor.decompress(chunk))
+                f.write(decompressor.flush())
+
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "downloaded_at": time.time(),
+            }
+
+        # Record the validators only once the file they describe is in place,
+        # and drop the old ones first, so an interrupted run can never pair
+        # validators (or the processed snapshot keyed on them) with the wrong file
+        validators_path.unlink(missing_ok=True)
+        shutil.move(partial_path, path)
+        write_file_atomic(validators_path, json.dumps(validators).encode())
+        return path
+
+    def _snapshot_key(self, *dataset_paths: Path) -> str:
+        """
+        Identify the processed output of the given cached datasets.
+
+        Each dataset's validators file is rewritten on every real download
+        (and left alone when the cached copy is reused or the server answers
+        304), so together with the processing config it changes exactly when
+        the processed titles could. Changes to the processing code itself are
+        covered by IMDB_TITLES_SNAPSHOT_VERSION.
+        """
+        config_json = self.config.model_dump_json(exclude={"cache_max_age_hours"})
+        key = hashlib.blake2b(f"{IMDB_TITLES_SNAPSHOT_VERSION}|{config_json}".encode(), digest_size=16)
+        for path in dataset_paths:
+            validators_path = path.with_name(path.name + ".validators.json")
+            if validators_path.exists():
+                key.update(validators_path.read_bytes())
+        return key.hexdigest()
+
+    def _read_snapshot(self, key: str) -> pl.DataFrame | None:
+        """Load the processed titles snapshot if it was written for key."""
+        snapshot_path = self.cache_dir / IMDB_TITLES_SNAPSHOT_NAME
+        key_path = snapshot_path.with_name(snapshot_path.name + ".key")
+        if not key_path.exists() or key_path.read_text() != key:
+            return None
+        return pl.read_parquet(snapshot_path)
+
+    def _write_snapshot(self, df: pl.DataFrame, key: str) -> None:
+        """Store the processed titles, then record the key they were built for."""
+        snapshot_path = self.cache_dir / IMDB_TITLES_SNAPSHOT_NAME
+        buffer = io.BytesIO()
+        df.write_parquet(buffer)
+        write_file_atomic(snapshot_path, buffer.getvalue())
+        write_file_atomic(snapshot_path.with_name(snapshot_path.name + ".key"), key.encode())
+
+    def _scan_basics_data(self, path: Path) -> pl.LazyFrame:
+        """Lazily read raw title basics data from the cached dataset."""
+        logger.info(f"Reading basic title data from {path}")
 
         columns = [
             "tconst", "titleType", "primaryTitle", "isAdult",
             "startYear", "endYear", "runtimeMinutes", "genres"
         ]
 
-        return pl.read_csv(
-            self.config.basics_url,
+        return pl.scan_csv(
+            path,
             separator="\t",
             quote_char=None,
-            columns=columns,
             null_values=[self.config.null_value],
-            use_pyarrow=True,
-        )
+            schema_overrides={
+                "tconst": pl.String,
+                "isAdult": pl.Int8,
+                "startYear": pl.Int16,
+                "endYear": pl.Int16,
+                "runtimeMinutes": pl.String,
+                "genres": pl.String,
+            },
+        ).select(columns)
 
-    def _process_basics_data(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _process_basics_data(self, df: pl.LazyFrame) -> pl.LazyFrame:
         """
         Process and filter basic title data.
 
         Args:
-            df: Raw basics DataFrame
+            df: Raw basics LazyFrame
 
         Returns:
-            Processed DataFrame with standardized columns and filtered content
+            Processed LazyFrame with standardized columns and filtered content
         """
         logger.info("Processing basic title data")
 
@@ -91,12 +231,10 @@ class IMDBDataProcessor:
             .drop(["isAdult", "runtimeMinutes"])
             # Convert and rename columns
             .with_columns([
-                pl.col("tconst").str.replace(IMDB_TITLE_ID_PREFIX, "").cast(pl.Int64),
+                pl.col("tconst").str.slice(len(IMDB_TITLE_ID_PREFIX)).cast(pl.Int64),
                 pl.col("titleType").eq("movie"),
-                pl.col("startYear").cast(pl.Int16),
-                pl.col("endYear").cast(pl.Int16),
                 pl.col("genres").str.split(self.config.genre_separator)
-                    .list.eval(pl.element().filter(pl.element().is_in(VALID_GENRES)))
+                    .list.eval(pl.element().filter(pl.element().is_in(VALID_GENRES_SET)))
             ])
             .rename({
                 "tconst": "id",
@@ -104,22 +242,25 @@ class IMDBDataProcessor:
             })
         )
 
-    def _download_ratings_data(self) -> pl.DataFrame:
-        """Download raw ratings data from IMDB."""
-        logger.info(f"Fetching ratings data from {self.config.ratings_url}")
+    def _scan_ratings_data(self, path: Path) -> pl.LazyFrame:
+        """Lazily read raw ratings data from the cached dataset."""
+        logger.info(f"Reading ratings data from {path}")
 
         columns = ["tconst", "averageRating", "numVotes"]
 
-        return pl.read_csv(
-            self.config.ratings_url,
+        return pl.scan_csv(
+            path,
             separator="\t",
             quote_char=None,
-            columns=columns,
             null_values=[self.config.null_value],
-            use_pyarrow=True,
-        )
+            schema_overrides={
+                "tconst": pl.String,
+                "averageRating": pl.Float64,
+                "numVotes": pl.Int64,
+            },
+        ).select(columns)
 
-    def _process_ratings_data(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _process_ratings_data(self, df: pl.LazyFrame) -> pl.LazyFrame:
         """
         Process and filter ratings data.
         """
@@ -128,8 +269,8 @@ class IMDBDataProcessor:
         return (
             df
             .with_columns(
-                pl.col("tconst").str.replace(IMDB_TITLE_ID_PREFIX, "").cast(pl.Int64),
-                pl.col("averageRating").mul(IMDB_RATING_MULTIPLIER).cast(pl.Int64)
+                pl.col("tconst").str.slice(len(IMDB_TITLE_ID_PREFIX)).cast(pl.Int64),
+                pl.col("averageRating").mul(IMDB_RATING_MULTIPLIER).cast(pl.Int16)  # 0-100 fits in Int16
             )
             .filter(pl.col("numVotes") >= self.config.min_votes)
             .rename({
@@ -141,22 +282,31 @@ class IMDBDataProcessor:
 
     def _join_title_and_ratings(
         self,
-        basics_df: pl.DataFrame,
-        ratings_df: pl.DataFrame
-    ) -> pl.DataFrame:
+        basics_df: pl.LazyFrame,
+        ratings_df: pl.LazyFrame
+    ) -> pl.LazyFrame:
         """
         Join title and ratings data.
+
+        Nothing is parsed until the joined frame is collected, so the
+        filters above are applied while the TSV files are read. Basics rows
+        are first semi-joined against the (much smaller) vote-filtered rating
+        IDs so only matching titles carry their columns into the full join.
         """
         logger.info("Joining title and ratings data")
-        return basics_df.join(ratings_df, on="id", how="inner")
+        rated_basics_df = basics_df.join(ratings_df.select("id"), on="id", how="semi")
+        return rated_basics_df.join(ratings_df, on="id", how="inner")
 
 
-def download_titles_from_imdb() -> pl.DataFrame:
+def download_titles_from_imdb(force_refresh: bool = False) -> pl.DataFrame:
     """
     Convenience function to download IMDB title data using default configuration.
 
+    Args:
+        force_refresh: Download the datasets even if the cached copies are current.
+
     Returns:
         pl.DataFrame: Processed IMDB title data
     """
-    processor = IMDBDataProcessor()
+    processor = IMDBDataProcessor(force_refresh=force_refresh)
     return processor.download_title_df()
@@ -3,26 +3,53 @@ Client for the OMDB (Open Movie Database) API.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Any
 from imdb_ratings import logger
-from imdb_ratings.core.constants import OMDB_BASE_URL, OMDB_REQUEST_TIMEOUT
+from imdb_ratings.core.constants import (
+    OMDB_BASE_URL,
+    OMDB_REQUEST_TIMEOUT,
+    OMDB_MAX_WORKERS,
+    OMDB_RETRY_TOTAL,
+    OMDB_RETRY_BACKOFF_FACTOR,
+    OMDB_RETRY_STATUS_CODES,
+)
 from imdb_ratings.core.exceptions import NetworkError
+from imdb_ratings.utils import TokenBucket
 
 
 class OMDBClient:
     """Client for interacting with OMDB API."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        rate_limiter: TokenBucket | None = None
+    ):
         """
         Initialize OMDB client.
 
         Args:
             api_key: OMDB API key
+            rate_limiter: Limiter acquired before each API request
         """
         self.api_key = api_key
         self.base_url = OMDB_BASE_URL
+        self.rate_limiter = rate_limiter
         self.session = requests.Session()
 
+        # Retry transient OMDB failures, and keep one connection per lookup worker alive
+        retries = Retry(
+            total=OMDB_RETRY_TOTAL,
+            backoff_factor=OMDB_RETRY_BACKOFF_FACTOR,
+            status_forcelist=OMDB_RETRY_STATUS_CODES,
+            allowed_methods=["GET"],
+        )
+        adapter = HTTPAdapter(max_retries=retries, pool_maxsize=OMDB_MAX_WORKERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
     def get_movie_data(self, imdb_id: str) -> dict[str, Any] | None:
         """
         Get movie data from OMDB API.
@@ -38,6 +65,9 @@ class OMDBClient:
             'i': imdb_id
         }
 
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
         try:
             response = self.session.get(self.base_url, params=params, timeout=OMDB_REQUEST_TIMEOUT)
             response.raise_for_status()
@@ -45,16 +75,16 @@ class OMDBClient:
             data = response.json()
 
             if data.get('Response') == 'False':
-                logger.warning(f"OMDB API error for {imdb_id}: {data.get('Error', 'Unknown error')}")
+                logger.warning("OMDB API error for %s: %s", imdb_id, data.get('Error', 'Unknown error'))
                 raise NetworkError(f"OMDB API error for {imdb_id}: {data.get('Error', 'Unknown error')}")
 
             return data
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Network error fetching OMDB data for {imdb_id}: {e}")
+            logger.error("Network error fetching OMDB data for %s: %s", imdb_id, e)
             raise NetworkError(f"Failed to fetch OMDB data: {e}")
         except ValueError as e:
-            logger.error(f"Invalid JSON response for {imdb_id}: {e}")
+            logger.error("Invalid JSON response for %s: %s", imdb_id, e)
             raise NetworkError(f"Invalid JSON response for {imdb_id}: {e}")
 
     def close(self):
@@ -1,12 +1,15 @@
+import hashlib
+import json
+from pathlib import Path
+from threading import Lock
 import requests
 from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError, RequestException, Timeout, ConnectionError
 from urllib3.util.retry import Retry
-from pydantic import BaseModel
 from imdb_ratings import logger
 from imdb_ratings.core.config import get_settings
 from imdb_ratings.core.constants import (
-    IMDB_GRAPHQL_HEADERS,
+    IMDB_GRAPHQL_REQUEST_HEADERS,
     IMDB_GRAPHQL_OPERATION_NAME,
     IMDB_GRAPHQL_PERSISTED_QUERY_HASH,
     IMDB_GRAPHQL_PAGE_SIZE,
@@ -22,17 +25,20 @@ from imdb_ratings.core.constants import (
     RATE_LIMIT_MAX_WAIT_SECONDS,
 )
 from imdb_ratings.core.exceptions import RateLimitError, DataValidationError, NetworkError
+from imdb_ratings.utils import TokenBucket, parse_retry_after, read_fresh_file, write_file_atomic
 import polars as pl
-from typing import TypedDict
+from typing import Iterator, TypedDict
 import time
 
-class ReviewData(BaseModel):
-    review_id: int
-    title_id: int
-    rating: int | None
-    num_helpful: int
-    num_unhelpful: int
-    num_words: int
+# Column dtypes of a scraped review DataFrame
+REVIEW_SCHEMA = pl.Schema({
+    "review_id": pl.Int64,
+    "title_id": pl.Int64,
+    "rating": pl.Int64,
+    "num_helpful": pl.Int64,
+    "num_unhelpful": pl.Int64,
+    "num_words": pl.Int64,
+})
 
 # Define the structure of the GraphQL response
 class ReviewPageInfo(TypedDict):
@@ -55,12 +61,20 @@ class ReviewsData(TypedDict):
     edges: list[ReviewEdge]
     pageInfo: ReviewPageInfo
 
+# The persisted-query reference is the same for every request, so serialize it once
+_EXTENSIONS_JSON = json.dumps(
+    {"persistedQuery": {"sha256Hash": IMDB_GRAPHQL_PERSISTED_QUERY_HASH, "version": 1}},
+    separators=(",", ":")
+)
+
 def create_requests_session() -> requests.Session:
     """Creates a requests session with retry logic and timeouts from config."""
     settings = get_settings()
     config = settings.scraping
 
     session = requests.Session()
+    # Set the constant GraphQL headers once instead of rebuilding them per request
+    session.headers.update(IMDB_GRAPHQL_REQUEST_HEADERS)
     
     retries = Retry(
         total=config.retry_total,
@@ -70,20 +84,69 @@ def create_requests_session() -> requests.Session:
         raise_on_status=False, # Handle status codes ourselves
     )
     
-    adapter = HTTPAdapter(max_retries=retries)
+    # Size the pool so every scraping worker can hold its own keep-alive connection
+    adapter = HTTPAdapter(max_retries=retries, pool_maxsize=config.max_workers)
     session.mount('http://', adapter)
     session.mount('https://', adapter)
     
     return session
 
+# Session owned by a scraping worker process (see init_process_session)
+_process_session: requests.Session | None = None
+
+def init_process_session() -> None:
+    """Create the session used by get_reviews_with_process_session in a worker process."""
+    global _process_session
+    _process_session = create_requests_session()
+
+def get_reviews_with_process_session(title_code: str) -> pl.DataFrame:
+    """
+    Extract all reviews for a title using the current worker process's session.
+
+    Intended as a ProcessPoolExecutor task with init_process_session as initializer.
+    """
+    if _process_session is None:
+        init_process_session()
+    return get_reviews_from_title_code(title_code, _process_session)
+
+# Rate limiter shared by every scraping thread in this process (see _get_rate_limiter)
+_rate_limiter: TokenBucket | None = None
+_rate_limiter_lock = Lock()
+
+def _get_rate_limiter() -> TokenBucket | None:
+    """
+    Get this process's GraphQL rate limiter, or None if request_delay is 0.
+
+    The bucket holds all workers together to one request per request_delay
+    on average, the same ceiling as sequential scraping, and a 429 pauses it
+    for every worker at once.
+    """
+    global _rate_limiter
+    config = get_settings().scraping
+    if _rate_limiter is None and config.request_delay > 0:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                # Threads share one bucket; each worker process gets its share of the rate
+                processes = config.max_workers if config.use_processes else 1
+                _rate_limiter = TokenBucket(rate=1 / (config.request_delay * processes), capacity=1)
+    return _rate_limiter
+
+def _review_page_cache_path(cursor: str, title_code: str) -> Path:
+    """Path of the cached response for one page of a title's reviews."""
+    key = hashlib.blake2b(f"{title_code}|{cursor}".encode(), digest_size=16).hexdigest()
+    return get_settings().cache_dir_path / "reviews" / f"{key}.json"
+
 def get_json_reviews(cursor: str, title_code: str, session: requests.Session) -> ReviewsData | None:
     """
     Fetch reviews from IMDB GraphQL API.
+
+    If scraping.review_cache_max_age_hours is set, valid responses are
+    cached on disk per (title, cursor) and reused until they expire.
     
     Args:
         cursor: Pagination cursor
         title_code: IMDB title code (e.g., 'tt1234567')
-        session: Requests session
+        session: Requests session (from create_requests_session)
         
     Returns:
         Review data or None if error
@@ -95,155 +158,211 @@ def get_json_reviews(cursor: str, title_code: str, session: requests.Session) ->
     settings = get_settings()
     config = settings.scraping
 
-    headers = {
-        "accept": "application/graphql+json, application/json",
-        "content-type": "application/json",
-    }
     querystring = {
-        "operationName":"TitleReviewsRefine",
-        "variables": f'{{"after":"{cursor}","const":"{title_code}","filter":{{}},"first":{IMDB_GRAPHQL_PAGE_SIZE},"locale":"{IMDB_GRAPHQL_LOCALE}","sort":{f'{{"by":"{IMDB_GRAPHQL_SORT_BY}","order":"{IMDB_GRAPHQL_SORT_ORDER}"}}'}}}',
-        "extensions":"{\"persistedQuery\":{\"sha256Hash\":\"fb58a77d474033025bf28e1fe68f9b998111d3df58e08cd8405bd9265b1a9aff\",\"version\":1}}"
+        "operationName": IMDB_GRAPHQL_OPERATION_NAME,
+        "variables": json.dumps(
+            {
+                "after": cursor,
+                "const": title_code,
+                "filter": {},
+                "first": IMDB_GRAPHQL_PAGE_SIZE,
+                "locale": IMDB_GRAPHQL_LOCALE,
+                "sort": {"by": IMDB_GRAPHQL_SORT_BY, "order": IMDB_GRAPHQL_SORT_ORDER},
+            },
+            separators=(",", ":")
+        ),
+        "extensions": _EXTENSIONS_JSON
     }
 
+    cache_path = _review_page_cache_path(cursor, title_code) if config.review_cache_max_age_hours else None
+    content = read_fresh_file(cache_path, config.review_cache_max_age_hours) if cache_path else None
+    from_cache = content is not None
+
     try:
-        response = session.get(
-            config.graphql_url,
-            headers=headers, 
-            params=querystring, 
-            timeout=config.request_timeout
-        )
+        if content is None:
+            rate_limiter = _get_rate_limiter()
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            response = session.get(
+                config.graphql_url,
+                params=querystring, 
+                timeout=config.request_timeout
+            )
 
-        if response.status_code == HTTP_STATUS_RATE_LIMITED:
-            retry_after = response.headers.get("Retry-After", str(RATE_LIMIT_BASE_WAIT_SECONDS))
-            logger.warning(f"Rate limit for {title_code} exceeded. Retry after {retry_after} seconds")
-            raise RateLimitError(f"Rate limited. Retry after {retry_after} seconds")
+            if response.status_code == HTTP_STATUS_RATE_LIMITED:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                logger.warning("Rate limit for %s exceeded. Retry after %s seconds", title_code, retry_after)
+                raise RateLimitError(f"Rate limited. Retry after {retry_after} seconds", retry_after=retry_after)
 
-        # Raise for other HTTP errors
-        response.raise_for_status()
+            # Raise for other HTTP errors
+            response.raise_for_status()
+            content = response.content
 
         try: 
-            json_data = response.json()
+            json_data = json.loads(content)
         except ValueError as e:
-            logger.error(f"Invalid JSON response for {title_code}: {e}")
+            logger.error("Invalid JSON response for %s: %s", title_code, e)
             raise DataValidationError(f"Invalid JSON response: {e}")
 
         if "data" not in json_data:
             if "errors" in json_data:
                 error_msg = json_data["errors"][0].get("message", "Unknown error")
-                logger.error(f"GraphQL error for {title_code}: {error_msg}")
+                logger.error("GraphQL error for %s: %s", title_code, error_msg)
                 raise DataValidationError(f"GraphQL error: {error_msg}")
             else:
-                logger.error(f"No data in response for {title_code}")
+                logger.error("No data in response for %s", title_code)
                 raise DataValidationError(f"No data in response: {json_data}")
             
         try:
-            return json_data["data"]["title"]["reviews"]
+            reviews_data = json_data["data"]["title"]["reviews"]
         except (KeyError, TypeError) as e:
-            logger.error(f"Unexpected response structure for {title_code}: {e}")
+            logger.error("Unexpected response structure for %s: %s", title_code, e)
             raise DataValidationError(f"Unexpected response structure: {e}")
 
+        if cache_path and not from_cache:
+            write_file_atomic(cache_path, content)
+        return reviews_data
+
     except Timeout:
-        logger.warning(f"Timeout fetching reviews for {title_code}")
+        logger.warning("Timeout fetching reviews for %s", title_code)
         raise NetworkError(f"Timeout fetching reviews for {title_code}")
     except ConnectionError as e:
-        logger.error(f"Connection error for {title_code}: {e}")
+        logger.error("Connection error for %s: %s", title_code, e)
         raise NetworkError(f"Connection error: {e}")
     except HTTPError as e:
         if e.response.status_code >= 500:
-            logger.warning(f"Server error for {title_code}: {e}")
+            logger.warning("Server error for %s: %s", title_code, e)
             return None
         else:
-            logger.error(f"Client error for {title_code}: {e}")
+            logger.error("Client error for %s: %s", title_code, e)
             raise NetworkError(f"HTTP error: {e}")
     except RequestException as e:
-        logger.error(f"Request failed for {title_code}: {e}")
+        logger.error("Request failed for %s: %s", title_code, e)
         raise NetworkError(f"Request failed: {e}")
 
-def extract_reviews_from_json(response_dict: ReviewsData, title_code: str) -> list[ReviewData]:
+def extract_reviews_from_json(response_dict: ReviewsData, title_code: str) -> pl.DataFrame:
     """
     Extract review data from GraphQL response.
+
+    Reviews without a rating, or below the configured helpful-vote and
+    word-count thresholds, are skipped here rather than filtered later.
+    Values are collected into one list per column, which Polars takes
+    as-is without transposing rows.
     
     Args:
         response_dict: GraphQL response data
         title_code: IMDB title code
         
     Returns:
-        List of ReviewData objects
+        DataFrame (REVIEW_SCHEMA) of the reviews that pass the review filters
 
     Raises:
         DataValidationError: If data validation fails
     """
-    reviews: list[ReviewData] = []
+    config = get_settings().scraping
+    review_ids: list[int] = []
+    ratings: list[int] = []
+    helpful_votes: list[int] = []
+    unhelpful_votes: list[int] = []
+    word_counts: list[int] = []
     errors_count = 0
+    edges = response_dict["edges"]
+
+    # The title ID is the same for every edge, so parse it once per page
+    try:
+        title_id = int(title_code[len(IMDB_TITLE_ID_PREFIX):])
+    except ValueError:
+        logger.debug("Cannot parse title ID: %s", title_code)
+        logger.warning("Skipped %d reviews due to errors", len(edges))
+        return pl.DataFrame(schema=REVIEW_SCHEMA)
 
-    for edge in response_dict["edges"]:
+    for edge in edges:
         try:
             node = edge["node"]
 
+            rating = node.get("authorRating")
+            if rating is None:
+                continue
+
+            helpfulness = node.get("helpfulness", {})
+            num_helpful = helpfulness.get("upVotes", 0)
+            if num_helpful <= config.min_helpful_votes:
+                continue
+
             review_text = node.get("text", {}).get("originalText", {}).get("plaidHtml", "")
             word_count = len(review_text.split()) if review_text else 0
+            if word_count < config.min_review_words:
+                continue
 
             review_id_str = node.get("id", "")
             if not review_id_str.startswith(IMDB_REVIEW_ID_PREFIX):
-                logger.debug(f"Invalid review ID format: {review_id_str}")
+                logger.debug("Invalid review ID format: %s", review_id_str)
                 errors_count += 1
                 continue
 
             try:
                 review_id = int(review_id_str[len(IMDB_REVIEW_ID_PREFIX):])
-                title_id = int(title_code[len(IMDB_TITLE_ID_PREFIX):])
             except ValueError:
-                logger.debug(f"Cannot parse IDs: review={review_id_str}, title={title_code}")
+                logger.debug("Cannot parse review ID: %s", review_id_str)
                 errors_count += 1
                 continue
 
-            reviews.append(
-                ReviewData(
-                    review_id=review_id,
-                    title_id=title_id,
-                    rating=node.get("authorRating"),
-                    num_helpful=node.get("helpfulness", {}).get("upVotes", 0),
-                    num_unhelpful=node.get("helpfulness", {}).get("downVotes", 0),
-                    num_words=word_count
-                )
-            )
+            num_unhelpful = helpfulness.get("downVotes", 0)
         except (KeyError, TypeError) as e:
-            logger.debug(f"Error extracting review from edge: {e}")
+            logger.debug("Error extracting review from edge: %s", e)
             errors_count += 1
             continue
 
+        review_ids.append(review_id)
+        ratings.append(rating)
+        helpful_votes.append(num_helpful)
+        unhelpful_votes.append(num_unhelpful)
+        word_counts.append(word_count)
+
     if errors_count > 0:
-        logger.warning(f"Skipped {errors_count} reviews due to errors")
-    return reviews
+        logger.warning("Skipped %d reviews due to errors", errors_count)
+
+    return pl.DataFrame(
+        {
+            "review_id": review_ids,
+            "title_id": [title_id] * len(review_ids),
+            "rating": ratings,
+            "num_helpful": helpful_votes,
+            "num_unhelpful": unhelpful_votes,
+            "num_words": word_counts,
+        },
+        schema=REVIEW_SCHEMA
+    )
 
-def get_reviews_from_title_code(
-    title_code: str, 
+def iter_review_pages(
+    title_code: str,
     requests_session: requests.Session,
     max_retries: int = SCRAPER_MAX_RETRIES
-    ) -> pl.DataFrame:
+    ) -> Iterator[pl.DataFrame]:
     """
-    Extract all reviews for a given title.
-    
+    Fetch a title's reviews page by page.
+
+    Each page is extracted straight into a small DataFrame, so no
+    per-review Python objects outlive their page.
+
     Args:
         title_code: IMDB title code (e.g., 'tt1234567')
         requests_session: Requests session to use
-        
-    Returns:
-        DataFrame with filtered reviews
 
-    Raises: 
+    Yields:
+        DataFrame of the filtered reviews on each non-empty page
+
+    Raises:
         NetworkError: If there's a network error
     """
-    settings = get_settings()
-    config = settings.scraping
-
     has_next_page: bool = True
     cursor: str = ""
-    reviews: list[ReviewData] = []
+    num_reviews = 0
     consecutive_failures = 0
     max_consecutive_failures = SCRAPER_MAX_CONSECUTIVE_FAILURES
 
-    logger.debug(f"Starting review extraction for {title_code}")
+    logger.debug("Starting review extraction for %s", title_code)
 
     while has_next_page:
         retry_count = 0
@@ -259,8 +378,9 @@ def get_reviews_from_title_code(
                     consecutive_failures += 1
                     if consecutive_failures >= max_consecutive_failures:
                         logger.warning(
-                            f"Too many consecutive failures ({consecutive_failures}) for {title_code}. "
-                            "Stopping extraction."
+                            "Too many consecutive failures (%d) for %s. Stopping extraction.",
+                            consecutive_failures,
+                            title_code
                         )
                         has_next_page = False
                     break
@@ -268,37 +388,54 @@ def get_reviews_from_title_code(
                 consecutive_failures = 0
                 has_next_page = bool(response_dict.get("pageInfo", {}).get("hasNextPage", False))
                 cursor = response_dict.get("pageInfo", {}).get("endCursor", "")
-                extracted = extract_reviews_from_json(response_dict, title_code)
-                reviews.extend(extracted)
+                page_df = extract_reviews_from_json(response_dict, title_code)
+                num_reviews += len(page_df)
 
-                logger.debug(f"Fetched {len(reviews)} reviews so far for {title_code}")
-                time.sleep(config.request_delay)
+                logger.debug("Fetched %d reviews so far for %s", num_reviews, title_code)
+                if not page_df.is_empty():
+                    yield page_df
                 break
 
-            except RateLimitError:
+            except RateLimitError as e:
                 retry_count += 1
                 if retry_count < max_retries:
-                    wait_time = min(RATE_LIMIT_BASE_WAIT_SECONDS * retry_count, RATE_LIMIT_MAX_WAIT_SECONDS)
-                    logger.info(f"Rate limited. Waiting {wait_time} seconds before retry {retry_count}/{max_retries}")
-                    time.sleep(wait_time)
+                    wait_time = e.retry_after if e.retry_after is not None else RATE_LIMIT_BASE_WAIT_SECONDS * retry_count
+                    wait_time = min(wait_time, RATE_LIMIT_MAX_WAIT_SECONDS)
+                    logger.info("Rate limited. Waiting %s seconds before retry %d/%d", wait_time, retry_count, max_retries)
+                    rate_limiter = _get_rate_limiter()
+                    if rate_limiter is not None:
+                        # Hold back every worker, not just this one; the retry blocks in acquire()
+                        rate_limiter.pause(wait_time)
+                    else:
+                        time.sleep(wait_time)
                 else:
-                    logger.error(f"Max retries exceeded for {title_code} due to rate limiting")
+                    logger.error("Max retries exceeded for %s due to rate limiting", title_code)
                     raise
             except NetworkError:
                 raise
 
-    # Convert to DataFrame
-    df = pl.DataFrame([review.model_dump() for review in reviews])
+    logger.debug("Extracted %d reviews for %s after filtering", num_reviews, title_code)
 
-    if df.is_empty():
-        return df
+def get_reviews_from_title_code(
+    title_code: str, 
+    requests_session: requests.Session,
+    max_retries: int = SCRAPER_MAX_RETRIES
+    ) -> pl.DataFrame:
+    """
+    Extract all reviews for a given title.
     
-    filtered_df = df.filter(
-        pl.col("rating").is_not_null() &
-        (pl.col("num_helpful") > config.min_helpful_votes) &
-        (pl.col("num_words") >= config.min_review_words)
-    )
+    Args:
+        title_code: IMDB title code (e.g., 'tt1234567')
+        requests_session: Requests session to use
+        
+    Returns:
+        DataFrame with filtered reviews
 
-    logger.debug(f"Extracted {len(filtered_df)}/{len(df)} reviews for {title_code} after filtering")
+    Raises: 
+        NetworkError: If there's a network error
+    """
+    pages = list(iter_review_pages(title_code, requests_session, max_retries))
+    if not pages:
+        return pl.DataFrame(schema=REVIEW_SCHEMA)
 
-    return filtered_df
+    return pl.concat(pages, how="vertical", rechunk=False)
@@ -2,24 +2,26 @@
 Pipeline Step 2: Update firstWorld column in titles table using OMDB API.
 """
 
-import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Iterator
 from imdb_ratings import logger
 from imdb_ratings.core.config import get_settings
+from imdb_ratings.core.constants import DB_IN_FILTER_MAX_VALUES, OMDB_MAX_IN_FLIGHT, OMDB_MAX_WORKERS
 from imdb_ratings.repository import TitleRepository
 from imdb_ratings.core.exceptions import NetworkError
 from imdb_ratings.core.database import get_database_client
 from imdb_ratings.updater.sources.omdb_client import OMDBClient
-from imdb_ratings.utils import format_imdb_id
+from imdb_ratings.utils import TokenBucket, format_imdb_id
 from supabase import Client
 
-NON_FIRST_WORLD_COUNTRIES = {
+NON_FIRST_WORLD_COUNTRIES = frozenset({
     "Argentina", "Bangladesh", "Brazil", "Bulgaria", "Chile",
     "Colombia", "Egypt", "Federal Republic of Yugoslavia", "India",
     "Indonesia", "Iran", "Kazakhstan", "Mexico",
     "Occupied Palestinian Territory", "Pakistan", "Philippines",
     "Romania", "Russia", "Saudi Arabia", "Serbia", "South Africa",
     "Soviet Union", "Sri Lanka", "Thailand", "Turkey", "Yugoslavia"
-}
+})
 
 
 def determine_first_world_status(country_string: str | None) -> bool | None:
@@ -36,14 +38,42 @@ def determine_first_world_status(country_string: str | None) -> bool | None:
     if not country_string:
         return None
 
-    countries = [country.strip() for country in country_string.split(',')]
+    # Most titles list a single country, which needs no splitting
+    if ',' not in country_string:
+        return country_string.strip() not in NON_FIRST_WORLD_COUNTRIES
 
-    all_non_first_world = all(
-        country in NON_FIRST_WORLD_COUNTRIES
-        for country in countries
+    # Stops at the first first-world country instead of checking them all
+    return any(
+        country.strip() not in NON_FIRST_WORLD_COUNTRIES
+        for country in country_string.split(',')
     )
 
-    return not all_non_first_world
+
+def _completed_lookups(
+    executor: ThreadPoolExecutor,
+    omdb_client: OMDBClient,
+    title_ids: list[int]
+) -> Iterator[tuple[Future[dict[str, Any] | None], int, str]]:
+    """
+    Look up titles on executor, yielding (future, title_id, imdb_id) as each completes.
+
+    At most OMDB_MAX_IN_FLIGHT lookups are submitted ahead of the consumer,
+    so stopping early leaves little queued work behind.
+    """
+    in_flight: dict[Future[dict[str, Any] | None], tuple[int, str]] = {}
+
+    for title_id in title_ids:
+        if len(in_flight) >= OMDB_MAX_IN_FLIGHT:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future, *in_flight.pop(future)
+
+        # Each title's IMDB ID is formatted once and kept alongside its future
+        imdb_id = format_imdb_id(title_id)
+        in_flight[executor.submit(omdb_client.get_movie_data, imdb_id)] = (title_id, imdb_id)
+
+    for future in as_completed(in_flight):
+        yield future, *in_flight[future]
 
 
 def update_first_world_status(
@@ -53,13 +83,20 @@ def update_first_world_status(
     """
     Update firstWorld column in titles table using OMDB API.
 
+    Lookups run on OMDB_MAX_WORKERS threads sharing one OMDB session and
+    a token bucket that holds API calls to one per delay_between_calls on
+    average; waiting on a slow response counts toward that delay.
+    Results are grouped by status and written from this thread in bulk,
+    one request per DB_IN_FILTER_MAX_VALUES titles.
+
     Args:
         supabase_client: Existing Supabase client or None to create a new one
-        delay_between_calls: Delay between API calls in seconds
+        delay_between_calls: Average delay between API calls in seconds (0 disables limiting)
     """
     logger.info("Starting firstWorld column update")
 
-    api_key = get_settings().omdb_api_key
+    settings = get_settings()
+    api_key = settings.omdb_api_key
     if not api_key:
         logger.warning("OMDB API key not found. Skipping firstWorld update.")
         raise ValueError("OMDB API key not found")
@@ -68,7 +105,10 @@ def update_first_world_status(
         supabase_client = get_database_client()
 
     title_repo = TitleRepository(supabase_client)
-    omdb_client = OMDBClient(api_key)
+    rate_limiter = None
+    if delay_between_calls > 0:
+        rate_limiter = TokenBucket(rate=1 / delay_between_calls, capacity=OMDB_MAX_WORKERS)
+    omdb_client = OMDBClient(api_key, rate_limiter=rate_limiter)
 
     try:
         logger.info("Fetching all titles with missing firstWorld data")
@@ -85,35 +125,49 @@ def update_first_world_status(
 
         total = len(titles_to_update)
 
-        for i, title_id in enumerate(titles_to_update, 1):
-            imdb_id = format_imdb_id(title_id)
-
-            try:
-                movie_data = omdb_client.get_movie_data(imdb_id)
-
-                if movie_data:
-                    country_string = movie_data.get('Country')
-                    first_world_status = determine_first_world_status(country_string)
-
-                    if first_world_status is not None:
-                        title_repo.update(
-                            data={"firstWorld": first_world_status},
-                            filters={"id": title_id}
-                        )
-                        updated_count += 1
-                        logger.info(f"({i} / {total}) Updated {imdb_id} firstWorld={first_world_status}")
+        # Title IDs classified but not yet written, keyed by firstWorld status
+        pending: dict[bool, list[int]] = {True: [], False: []}
+
+        executor = ThreadPoolExecutor(max_workers=OMDB_MAX_WORKERS)
+        try:
+            lookups = _completed_lookups(executor, omdb_client, titles_to_update)
+            for i, (future, title_id, imdb_id) in enumerate(lookups, 1):
+                try:
+                    movie_data = future.result()
+
+                    if movie_data:
+                        country_string = movie_data.get('Country')
+                        first_world_status = determine_first_world_status(country_string)
+
+                        if first_world_status is not None:
+                            pending_ids = pending[first_world_status]
+                            pending_ids.append(title_id)
+                            if len(pending_ids) >= DB_IN_FILTER_MAX_VALUES:
+                                # Taken out of pending first, so a failed write isn't resent by the finally below
+                                pending[first_world_status] = []
+                                title_repo.set_first_world_bulk(pending_ids, first_world_status)
+                            updated_count += 1
+                            logger.info("(%d / %d) Classified %s firstWorld=%s", i, total, imdb_id, first_world_status)
+                        else:
+                            logger.warning("(%d / %d) No country data for %s", i, total, imdb_id)
+                            error_count += 1
                     else:
-                        logger.warning(f"({i} / {total}) No country data for {imdb_id}")
                         error_count += 1
-                else:
-                    error_count += 1
-
-            except NetworkError:
-                error_count += 1
-                logger.error(f"({i} / {total}) Skipping {imdb_id} due to network error")
-                continue
 
-            time.sleep(delay_between_calls)
+                except NetworkError:
+                    error_count += 1
+                    logger.error("(%d / %d) Skipping %s due to network error", i, total, imdb_id)
+                    continue
+
+        except BaseException:
+            # Don't wait for queued lookups whose results would be discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            executor.shutdown()
+            # Write whatever was classified, even if the loop stopped early
+            for first_world_status, pending_ids in pending.items():
+                title_repo.set_first_world_bulk(pending_ids, first_world_status)
 
         logger.info(f"firstWorld update completed. Updated: {updated_count}, Errors: {error_count}")
 
@@ -2,14 +2,56 @@
 Pipeline Step 3: Scrape and update reviews for titles needing updates.
 """
 
-from imdb_ratings.updater.sources.scrape_reviews import create_requests_session, get_reviews_from_title_code
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from functools import partial
+from multiprocessing import get_context
+from typing import Callable, Iterator
+from imdb_ratings.updater.sources.scrape_reviews import (
+    create_requests_session,
+    get_reviews_from_title_code,
+    get_reviews_with_process_session,
+    init_process_session,
+)
 from imdb_ratings.utils import format_imdb_id
+import polars as pl
+import requests
 from supabase import Client
 from imdb_ratings import logger
+from imdb_ratings.core.config import get_settings
+from imdb_ratings.core.constants import REVIEW_FLUSH_TITLES
 from imdb_ratings.core.database import get_database_client
 from imdb_ratings.repository import TitleRepository, ReviewRepository
 
 
+def _completed_scrapes(
+    executor: Executor,
+    scrape: Callable[[str], pl.DataFrame],
+    title_ids: list[int],
+    max_in_flight: int
+) -> Iterator[tuple[Future[pl.DataFrame], int, str]]:
+    """
+    Scrape titles on executor, yielding (future, title_id, title_code) as each completes.
+
+    At most max_in_flight titles are submitted ahead of the consumer, so
+    finished results are not held in memory and stopping early leaves
+    little queued work behind.
+    """
+    in_flight: dict[Future[pl.DataFrame], tuple[int, str]] = {}
+
+    for title_id in title_ids:
+        if len(in_flight) >= max_in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future, *in_flight.pop(future)
+
+        # Each title's IMDB code is formatted once and kept alongside its future
+        title_code = format_imdb_id(title_id)
+        in_flight[executor.submit(scrape, title_code)] = (title_id, title_code)
+
+    for future in as_completed(in_flight):
+        yield future, *in_flight[future]
+
+
 def update_reviews_table(supabase_client: Client | None = None, titles_to_update: list[int] | None = None) -> None:
     """
     Updates reviews table by scraping IMDB for review data.
@@ -26,32 +68,90 @@ def update_reviews_table(supabase_client: Client | None = None, titles_to_update
     title_repo = TitleRepository(supabase_client)
     review_repo = ReviewRepository(supabase_client)
 
-    requests_session = create_requests_session()
-
     if titles_to_update is None:
         titles_to_update = title_repo.get_titles_needing_update()
         logger.info(f"Found {len(titles_to_update)} titles to process")
 
-    try:
-        for i, title_id in enumerate(titles_to_update):
-            title_code = format_imdb_id(title_id)
-            logger.info(f"Processing reviews for {i+1}/{len(titles_to_update)} titles: {title_code}")
+    config = get_settings().scraping
 
-            try:
-                review_df = get_reviews_from_title_code(title_code, requests_session)
-                if not review_df.is_empty():
+    # Threads share one session; processes each own a session and parse in parallel
+    executor: Executor
+    requests_session: requests.Session | None = None
+    if config.use_processes:
+        logger.info(f"Scraping reviews with {config.max_workers} worker processes")
+        executor = ProcessPoolExecutor(
+            max_workers=config.max_workers,
+            mp_context=get_context("spawn"),
+            initializer=init_process_session
+        )
+        scrape = get_reviews_with_process_session
+    else:
+        logger.info(f"Scraping reviews with {config.max_workers} workers")
+        executor = ThreadPoolExecutor(max_workers=config.max_workers)
+        requests_session = create_requests_session()
+        scrape = partial(get_reviews_from_title_code, requests_session=requests_session)
+
+    # Scraped titles (and their reviews) waiting to be written together
+    pending_title_ids: list[int] = []
+    pending_frames: list[pl.DataFrame] = []
+
+    def flush_pending() -> None:
+        """Upsert the pending reviews in one call, then mark their titles updated."""
+        if not pending_title_ids:
+            return
+
+        try:
+            review_repo.upsert_reviews(pl.concat(pending_frames))
+            stored_title_ids = list(pending_title_ids)
+        except Exception as e:
+            # Fall back to one upsert per title so one bad title doesn't sink the rest
+            logger.warning("Batched review upsert failed, retrying %d titles individually: %s", len(pending_title_ids), e)
+            stored_title_ids = []
+            for title_id, review_df in zip(pending_title_ids, pending_frames):
+                try:
                     review_repo.upsert_reviews(review_df)
-                    title_repo.mark_titles_updated(title_id)
-                else:
-                    logger.debug(f"No reviews found for {title_code}")
-            except Exception as e:
-                logger.error(f"Error processing {title_code}: {str(e)}")
-                continue
+                    stored_title_ids.append(title_id)
+                except Exception as title_error:
+                    logger.error("Error storing reviews for %s: %s", format_imdb_id(title_id), title_error)
+
+        title_repo.mark_titles_updated_bulk(stored_title_ids)
+        pending_title_ids.clear()
+        pending_frames.clear()
+
+    try:
+        # Titles are scraped concurrently; results are written from this thread as they finish
+        try:
+            scrapes = _completed_scrapes(executor, scrape, titles_to_update, 2 * config.max_workers)
+            for i, (future, title_id, title_code) in enumerate(scrapes, 1):
+                logger.info("Processing reviews for %d/%d titles: %s", i, len(titles_to_update), title_code)
+
+                try:
+                    review_df = future.result()
+                    if not review_df.is_empty():
+                        pending_title_ids.append(title_id)
+                        pending_frames.append(review_df)
+                        if len(pending_title_ids) >= REVIEW_FLUSH_TITLES:
+                            flush_pending()
+                    else:
+                        logger.debug("No reviews found for %s", title_code)
+                except Exception as e:
+                    logger.error("Error processing %s: %s", title_code, e)
+                    continue
+
+        except BaseException:
+            # Don't wait for queued scrapes whose results would be discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            executor.shutdown()
+
+        flush_pending()
 
     except Exception as e:
         logger.error(f"Error updating reviews: {str(e)}")
         raise
     finally:
-        requests_session.close()
+        if requests_session is not None:
+            requests_session.close()
 
     logger.info("Reviews table update completed")
@@ -11,7 +11,7 @@ from imdb_ratings.repository import TitleRepository
 import polars as pl
 
 
-def update_title_table(supabase_client: Client | None = None) -> None:
+def update_title_table(supabase_client: Client | None = None, force_refresh: bool = False) -> None:
     """
     Update the title table with the latest data from IMDB.
 
@@ -20,30 +20,32 @@ def update_title_table(supabase_client: Client | None = None) -> None:
 
     Args:
         supabase_client: Existing Supabase client or None to create a new one
+        force_refresh: Re-download the IMDB datasets even if the cache is current
     """
     logger.info("Starting title table update")
-    title_df_from_imdb = download_titles_from_imdb()
+    title_df_from_imdb = download_titles_from_imdb(force_refresh=force_refresh)
 
     if supabase_client is None:
         supabase_client = get_database_client()
 
     title_repo = TitleRepository(supabase_client)
-    title_df_from_supabase = title_repo.get_all_as_dataframe()
-    titles_to_update = title_df_from_imdb
-
-    if len(title_df_from_supabase) > 0:
-        titles_to_update = titles_to_update.join(
-            title_df_from_supabase.select(["id", "num_votes"]).rename({"num_votes": "num_votes_supabase"}),
-            on="id",
-            how="left"
-        ).filter(
-            (pl.col("num_votes_supabase").is_null()) |  # ID absent from Supabase
-            (pl.col("num_votes") >= pl.col("num_votes_supabase") * VOTE_INCREASE_THRESHOLD)  # At least 5% more votes
-        ).select(title_df_from_imdb.columns)
+    votes_from_supabase = title_repo.get_vote_counts()
+
+    # Build the diff lazily so Polars plans the joins, filter and projection together
+    imdb_titles = title_df_from_imdb.lazy()
+    stored_votes = votes_from_supabase.lazy().rename({"num_votes": "num_votes_supabase"})
+
+    # Titles absent from Supabase, plus stored titles with no vote count or at least 5% more votes
+    new_titles = imdb_titles.join(stored_votes, on="id", how="anti")
+    changed_titles = imdb_titles.join(stored_votes, on="id", how="inner").filter(
+        (pl.col("num_votes_supabase").is_null()) |  # Stored without a vote count
+        (pl.col("num_votes") >= pl.col("num_votes_supabase") * VOTE_INCREASE_THRESHOLD)  # At least 5% more votes
+    ).select(title_df_from_imdb.columns)
+    titles_to_update = pl.concat([new_titles, changed_titles])
 
     titles_to_update = titles_to_update.with_columns(
         pl.lit(True).alias("needsUpdate")
-    )
+    ).collect()
 
     title_repo.upsert_titles(titles_to_update)
 
@@ -2,7 +2,15 @@
 Shared utility functions for the updater module.
 """
 
-from imdb_ratings.core.constants import IMDB_TITLE_ID_FORMAT
+import math
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from threading import Lock
+from imdb_ratings.core.constants import IMDB_TITLE_ID_PREFIX
 
 
 def format_imdb_id(title_id: int) -> str:
@@ -18,4 +26,101 @@ def format_imdb_id(title_id: int) -> str:
     Returns:
         Formatted IMDB ID string (e.g., "tt0111161")
     """
-    return IMDB_TITLE_ID_FORMAT.format(title_id)
+    return f"{IMDB_TITLE_ID_PREFIX}{title_id:07d}"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header into seconds to wait.
+
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing, malformed or not finite
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # float() also accepts "inf" and "nan", which no server means literally
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def read_fresh_file(path: Path, max_age_hours: float) -> bytes | None:
+    """
+    Read a cached file if it exists and is younger than max_age_hours.
+
+    Returns:
+        The file contents, or None if the file is missing or expired
+    """
+    try:
+        if time.time() - path.stat().st_mtime < max_age_hours * 3600:
+            return path.read_bytes()
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def write_file_atomic(path: Path, content: bytes) -> None:
+    """Write a file via a temporary sibling, so concurrent readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".part", delete=False) as f:
+        f.write(content)
+    os.replace(f.name, path)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    acquire() takes one token and only sleeps when the bucket is empty, so
+    time already spent waiting on slow responses counts toward the rate.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_update = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        """Take one token, blocking until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._last_update) * self.rate)
+                    self._last_update = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next `seconds`, e.g. after a Retry-After response."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            # Start refilling from empty once the pause ends
+            self._tokens = 0
+            self._last_update = self._paused_until